@@ -29,9 +29,10 @@ import logging
 import traceback
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
 # ---------------------------------------------------------------------------------------------
 # 🧭 Early Bootstrap — Load .env and Normalize Environment
@@ -65,56 +66,16 @@ from backend.routers import tickets, users
 # Load settings once
 settings = get_settings()
 
-# ---------------------------------------------------------------------------------------------
-# 🚀 App Initialization
-# ---------------------------------------------------------------------------------------------
-app = FastAPI(
-    title="OAPS Zendesk App",
-    description="Internal DOE tool for bi-weekly Zendesk reporting, reassignment, and export.",
-    version="2.0.0",
-)
-
-# ---------------------------------------------------------------------------------------------
-# 🌐 CORS Configuration
-# ---------------------------------------------------------------------------------------------
-origins = os.getenv("CORS_ORIGINS", "").split(",")
-if origins:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[o.strip() for o in origins if o.strip()],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-# ---------------------------------------------------------------------------------------------
-# 🔐 Middleware
-# ---------------------------------------------------------------------------------------------
-app.add_middleware(TokenAuthMiddleware)
-app.add_middleware(RateLimitMiddleware)
-
-# ---------------------------------------------------------------------------------------------
-# 🧩 Router Registration
-# ---------------------------------------------------------------------------------------------
-# v1 legacy
-app.include_router(tickets.router, prefix="/api/tickets", tags=["Tickets"])
-app.include_router(users.router, prefix="/api/users", tags=["Users"])
-# v2 current
-app.include_router(tickets.router, prefix="/api/v2/tickets", tags=["Tickets"])
-app.include_router(users.router, prefix="/api/v2/users", tags=["Users"])
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------------------------
 # ⚙️ Exception Handling
 # ---------------------------------------------------------------------------------------------
-register_exception_handlers(app)
-logger = logging.getLogger(__name__)
-
-@app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Catch-all exception handler ensuring JSON response even for uncaught errors."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     error_response = {"error": str(exc), "path": str(request.url.path)}
-    if getattr(app, "debug", False):
+    if getattr(request.app, "debug", False):
         error_response["detail"] = traceback.format_exc()
 
     return JSONResponse(
@@ -125,17 +86,64 @@ async def global_exception_handler(request: Request, exc: Exception):
 # ---------------------------------------------------------------------------------------------
 # 🩺 Health Check
 # ---------------------------------------------------------------------------------------------
-@app.get("/", tags=["Health"])
 def read_root() -> dict[str, str]:
     return {"status": "ok", "message": "Zendesk Reporting API is running"}
 
-@app.get("/health", tags=["Health"])
 def health() -> dict[str, str]:
     return {"status": "ok"}
 
-@app.get("/api/v2/health", tags=["Health"])
-def health_v2() -> dict[str, str]:
-    return {"status": "ok", "version": app.version}
+def health_v2(request: Request) -> dict[str, str]:
+    return {"status": "ok", "version": request.app.version}
+
+# ---------------------------------------------------------------------------------------------
+# 🚀 App Factory
+# ---------------------------------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def get_app() -> FastAPI:
+    """Build the application once; later calls (and `app` below) share the same instance."""
+    app = FastAPI(
+        title="OAPS Zendesk App",
+        description="Internal DOE tool for bi-weekly Zendesk reporting, reassignment, and export.",
+        version="2.0.0",
+        default_response_class=ORJSONResponse,
+    )
+
+    # 🌐 CORS Configuration
+    origins = os.getenv("CORS_ORIGINS", "").split(",")
+    if origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[o.strip() for o in origins if o.strip()],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+    # 🔐 Middleware
+    app.add_middleware(TokenAuthMiddleware)
+    app.add_middleware(RateLimitMiddleware)
+
+    # 🧩 Router Registration
+    # v1 legacy
+    app.include_router(tickets.router, prefix="/api/tickets", tags=["Tickets"])
+    app.include_router(users.router, prefix="/api/users", tags=["Users"])
+    # v2 current
+    app.include_router(tickets.router, prefix="/api/v2/tickets", tags=["Tickets"])
+    app.include_router(users.router, prefix="/api/v2/users", tags=["Users"])
+
+    # ⚙️ Exception Handling
+    register_exception_handlers(app)
+    app.add_exception_handler(Exception, global_exception_handler)
+
+    # 🩺 Health Check
+    app.add_api_route("/", read_root, methods=["GET"], tags=["Health"])
+    app.add_api_route("/health", health, methods=["GET"], tags=["Health"])
+    app.add_api_route("/api/v2/health", health_v2, methods=["GET"], tags=["Health"])
+
+    return app
+
+
+app = get_app()
 
 # ---------------------------------------------------------------------------------------------
 # 🧠 Lifespan Hook
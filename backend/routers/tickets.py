@@ -28,8 +28,10 @@
 # ============================================================================================
 
 import os
-import json
+import anyio
+import orjson
 from datetime import datetime, timezone
+from functools import lru_cache, partial
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, Body, Query, Depends, Request
 from fastapi.responses import JSONResponse
@@ -93,18 +95,22 @@ def _write_export_meta(meta: dict) -> None:
     path = _get_export_meta_path()
     _ensure_parent_dir(path)
     try:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        path.write_bytes(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
     except Exception:
         # Do not fail the main request on metadata write issues
         logger.warning("Failed to write export metadata", exc_info=True)
 
+@lru_cache(maxsize=4)
+def _load_export_meta(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse the metadata file; keyed on (mtime, size) so a rewrite invalidates the entry."""
+    return orjson.loads(Path(path).read_bytes())
+
 def _read_export_meta() -> dict:
     try:
         path = _get_export_meta_path()
         if path.exists():
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            st = path.stat()
+            return dict(_load_export_meta(str(path), st.st_mtime_ns, st.st_size))
     except Exception:
         logger.warning("Failed to read export metadata", exc_info=True)
     return {}
@@ -198,19 +204,12 @@ def patch_ticket(ticket_id: int, body: Dict[str, Any] = Body(...)):
         logger.error(f"Zendesk update failed for ticket {ticket_id}: {e}")
         raise HTTPException(status_code=400, detail=f"Zendesk update failed: {e}")
 
-@router.post("/export")
-def export_and_email(
-    group_ids: Optional[str] = Query(default=None),
-    statuses: Optional[str] = Query(default=None),
-    ids_csv: Optional[str] = Query(default=None)
+def _load_export_dataset(
+    group_ids_list: Optional[List[str]],
+    statuses_list: Optional[List[str]],
+    ids_csv: Optional[str],
 ):
-    logger.info("Starting export_and_email")
-
-    # Normalize parameters
-    group_ids_list = [g.strip() for g in group_ids.split(",")] if group_ids and group_ids.strip() else None
-    statuses_list = [s.strip() for s in statuses.split(",")] if statuses and statuses.strip() else None
-
-    # Pull dataset (same logic as /tickets)
+    """Blocking Zendesk pull for /export: tickets + enriched status map (same logic as /tickets)."""
     if ids_csv:
         ticket_ids = [s.strip() for s in ids_csv.split(",") if s.strip().isdigit()]
         tickets = zd.show_many(ticket_ids)
@@ -224,16 +223,33 @@ def export_and_email(
 
     status_map = zd.build_status_map(tickets)
     zd.enrich_with_resolution_times(status_map)
+    return tickets, status_map
+
+@router.post("/export")
+async def export_and_email(
+    group_ids: Optional[str] = Query(default=None),
+    statuses: Optional[str] = Query(default=None),
+    ids_csv: Optional[str] = Query(default=None)
+):
+    logger.info("Starting export_and_email")
+
+    # Normalize parameters
+    group_ids_list = [g.strip() for g in group_ids.split(",")] if group_ids and group_ids.strip() else None
+    statuses_list = [s.strip() for s in statuses.split(",")] if statuses and statuses.strip() else None
+
+    # Blocking and CPU-bound steps run in worker threads; only the trivial window math stays on the loop.
+    # Each step is awaited directly, so errors reach the exception handlers unwrapped.
+    tickets, status_map = await anyio.to_thread.run_sync(_load_export_dataset, group_ids_list, statuses_list, ids_csv)
     win = helpers.compute_meeting_window()
-    rows = helpers.build_ticket_rows(tickets, status_map, win, bucketed=True)
+    rows = await anyio.to_thread.run_sync(partial(helpers.build_ticket_rows, tickets, status_map, win, bucketed=True))
 
     # Create workbook in-memory
-    wb_bytes, filename_display = helpers.make_ticket_workbook(rows)
+    wb_bytes, filename_display = await anyio.to_thread.run_sync(helpers.make_ticket_workbook, rows)
     logger.info(f"Workbook created: {filename_display}")
 
-    # Upload to SharePoint
+    # Upload to SharePoint (email below needs the resulting URL, so these stay sequential)
     try:
-        web_url = sharepoint_service.upload_bytes(filename_display, wb_bytes)
+        web_url = await anyio.to_thread.run_sync(sharepoint_service.upload_bytes, filename_display, wb_bytes)
         if not web_url:
             raise Exception("Empty SharePoint webUrl")
         logger.info(f"SharePoint upload succeeded: {web_url}")
@@ -243,11 +259,10 @@ def export_and_email(
 
     # Send email
     try:
-        result = email_service.send_directors_export_link(web_url, filename_display)
+        result = await anyio.to_thread.run_sync(email_service.send_directors_export_link, web_url, filename_display)
         # Handle async functions or mock raising
         if hasattr(result, "__await__"):
-            import asyncio
-            asyncio.run(result)
+            await result
         logger.info("Email notification sent successfully")
     except Exception as e:
         logger.error(f"Email send failed: {e}")
@@ -266,7 +281,7 @@ def export_and_email(
             "ids_csv": ids_csv,
         },
     }
-    _write_export_meta(meta)
+    await anyio.to_thread.run_sync(_write_export_meta, meta)
 
     logger.info("Export and email completed successfully")
 
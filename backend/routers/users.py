@@ -1,7 +1,6 @@
 # backend/routers/users.py
 from typing import Dict, List
 from fastapi import APIRouter, HTTPException
-import requests
 from backend.services.zendesk_service import _auth, _retry, _get_config 
 
 # 🔹 Enhancement: expose zendesk_service as "zd" so tests can monkeypatch
@@ -32,7 +31,7 @@ def list_users():
 
         # 🔹 Original implementation preserved for live Zendesk API
         url = f"{BASE}/users.json?role=agent"
-        r = _retry(requests.get, url, auth=_auth(), timeout=30)
+        r = _retry("GET", url, auth=_auth(), timeout=30)
         users: List[User] = []
         for u in r.json().get("users", []):
             if u.get("group_id") in OAPS_GROUP_IDS:  # restrict to OAPS groups
@@ -5,13 +5,26 @@
 # Author: OAPS QA Analytics Team
 # =====================================================================
 
-import os, time, requests
+import os, sys, time, threading, requests
+import orjson
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase, HTTPBasicAuth
+from urllib.parse import quote, urlencode
 from typing import Iterable, List, Dict, Any, Optional
 from backend.utils.logger import get_logger
 
 
 logger = get_logger("zendesk_service")
 
+# Pooled keep-alive connections to Zendesk for every call (paginated GETs included);
+# 429 retries stay in _retry()
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0))
+_session.headers.update({"Accept": "application/json"})
+
 # 🚨 PATCH 1: REMOVE top-level environment variable access 🚨
 # ZD_SUBDOMAIN = os.getenv("ZENDESK_SUBDOMAIN")
 # ZD_EMAIL     = os.getenv("ZENDESK_EMAIL")
@@ -20,9 +33,33 @@ logger = get_logger("zendesk_service")
 # OAPS_GROUP_IDS = [gid.strip() for gid in os.getenv("OAPS_GROUP_IDS", "").split(",") if gid.strip()]
 
 
+# Proactive pacing below Zendesk's 700 req/min account limit (override: ZENDESK_MAX_REQUESTS_PER_MIN)
+DEFAULT_MAX_REQUESTS_PER_MIN = 600
+
+
+def _parse_rate(raw: Optional[str]) -> int:
+    """Parses the per-minute request budget; unset, malformed or non-positive values use the default."""
+    if raw is None or not raw.strip():
+        return DEFAULT_MAX_REQUESTS_PER_MIN
+    try:
+        rate = int(raw)
+    except ValueError:
+        rate = 0
+    if rate <= 0:
+        logger.warning(
+            f"Invalid ZENDESK_MAX_REQUESTS_PER_MIN={raw!r}; using {DEFAULT_MAX_REQUESTS_PER_MIN}"
+        )
+        return DEFAULT_MAX_REQUESTS_PER_MIN
+    return rate
+
+
 # 🚨 PATCH 2: ADD helper to safely retrieve config at runtime 🚨
+@lru_cache(maxsize=1)
 def _get_config() -> Dict[str, Any]:
-    """Retrieves all necessary Zendesk config from environment variables."""
+    """
+    Retrieves all necessary Zendesk config from environment variables.
+    Read lazily on first use (never at import) and cached; see reload_config for rotation.
+    """
     subdomain = os.getenv("ZENDESK_SUBDOMAIN")
     email = os.getenv("ZENDESK_EMAIL")
     token = os.getenv("ZENDESK_API_TOKEN")
@@ -35,8 +72,8 @@ def _get_config() -> Dict[str, Any]:
         "oaps_group_ids": [
             gid.strip() for gid in os.getenv("OAPS_GROUP_IDS", "").split(",") if gid.strip()
         ],
+        "max_requests_per_min": _parse_rate(os.getenv("ZENDESK_MAX_REQUESTS_PER_MIN")),
     }
-    
     # Safe startup log (moved inside this function, which runs first)
     logger.info(
         f"Zendesk service config loaded (subdomain={_safe_token(config['subdomain'])}, email={_safe_email(config['email'])}, token={_safe_token(config['token'])})"
@@ -44,6 +81,32 @@ def _get_config() -> Dict[str, Any]:
     
     return config
 
+
+_load_config = _get_config  # the cached loader itself, even while tests patch _get_config
+
+
+def reload_config() -> Dict[str, Any]:
+    """
+    Drops the cached config and re-reads it from the environment.
+    Nothing in the app calls this on its own: whatever rotates ZENDESK_EMAIL / ZENDESK_API_TOKEN /
+    ZENDESK_SUBDOMAIN in the running process (secret-rotation job, admin hook) must call it
+    afterwards. Session auth is resolved per request (_ZendeskAuth), so it follows automatically.
+    """
+    _load_config.cache_clear()
+    return _load_config()
+
+
+class _ZendeskAuth(AuthBase):
+    """Session auth built from the current config on each request, so reload_config() takes effect."""
+
+    def __call__(self, r):
+        config = _get_config()
+        return HTTPBasicAuth(f"{config['email']}/token", config['token'])(r)
+
+
+# Session-level auth so each request through _retry() carries it without per-call tuples
+_session.auth = _ZendeskAuth()
+
 # -------------------
 # Helper Functions
 # -------------------
@@ -75,16 +138,83 @@ def _auth():
 # )
 
 
-def _retry(req_callable, *args, **kwargs):
-    """Handles Zendesk rate limiting and retries once on 429."""
-    r = req_callable(*args, **kwargs)
-    if r.status_code == 429:
-        wait = int(r.headers.get("Retry-After", "3")) + 1
-        logger.warning(f"429 rate limit hit. Retrying after {wait}s...")
+class _TokenBucket:
+    """Thread-safe token bucket; `acquire()` blocks just long enough to stay under the rate."""
+
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.capacity = float(max_rate)
+        self.fill_rate = max_rate / time_period
+        self.tokens = float(max_rate)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+            self.tokens -= 1  # reserve a slot; a negative balance is the caller's wait
+            wait = -self.tokens / self.fill_rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+@lru_cache(maxsize=None)
+def _limiter_for(max_rate: int) -> _TokenBucket:
+    """One shared bucket per configured rate, so every call through _retry() paces together."""
+    return _TokenBucket(max_rate, 60)
+
+
+class _Response:
+    """Thin requests.Response proxy whose .json() decodes the raw body with orjson."""
+
+    __slots__ = ("_r",)
+
+    def __init__(self, r: requests.Response):
+        self._r = r
+
+    def json(self) -> Any:
+        return orjson.loads(self._r.content)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._r, name)
+
+
+# Status -> methods that may be retried. 429s were never processed, so any method is safe;
+# transient 5xx are only retried for GETs so a PUT (e.g. add_comment) is never applied twice.
+_RETRY_STATUSES = {
+    429: None,
+    500: frozenset({"GET"}),
+    502: frozenset({"GET"}),
+    503: frozenset({"GET"}),
+    504: frozenset({"GET"}),
+}
+_MAX_ATTEMPTS = 2
+_RETRY_BACKOFF_SECONDS = 1.0
+
+
+def _retry(method: str, url: str, **kwargs):
+    """Sends `method url` on the shared session; retries per _RETRY_STATUSES, raising only once exhausted.
+    Returns the response wrapped in _Response so .json() parses with orjson."""
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        _limiter_for(_get_config().get("max_requests_per_min", DEFAULT_MAX_REQUESTS_PER_MIN)).acquire()
+        r = _session.request(method, url, **kwargs)
+        status = r.status_code
+        if status not in _RETRY_STATUSES or attempt == _MAX_ATTEMPTS:
+            break
+        methods = _RETRY_STATUSES[status]
+        if methods is not None and method not in methods:
+            break
+        if status == 429:
+            wait = int(r.headers.get("Retry-After", "3")) + 1
+            logger.warning(f"429 rate limit hit. Retrying after {wait}s...")
+        else:
+            wait = _RETRY_BACKOFF_SECONDS * attempt
+            logger.warning(f"{status} from Zendesk on {method}. Retrying after {wait}s...")
         time.sleep(wait)
-        r = req_callable(*args, **kwargs)
-    r.raise_for_status()
-    return r
+    if not 200 <= status < 300:
+        r.raise_for_status()  # only non-2xx responses pay for requests' error checks
+    return _Response(r)
 
 
 # -------------------
@@ -93,6 +223,35 @@ def _retry(req_callable, *args, **kwargs):
 
 # 🚨 PATCH 5: Update all service functions to use BASE/OAPS_GROUP_IDS from _get_config 🚨
 
+# Concurrent show_many batches; keep at or below the session's pool_maxsize
+SHOW_MANY_MAX_WORKERS = 10
+
+
+def _fetch_tickets_page(url: str) -> List[Dict[str, Any]]:
+    logger.debug(f"GET {url}")
+    r = _retry("GET", url, timeout=30)
+    tickets = r.json().get("tickets", [])
+    logger.debug(f"Fetched {len(tickets)} tickets from show_many batch")
+    return tickets
+
+
+def _show_many_urls(base: str, ids: List[str], include: Optional[str] = None) -> List[str]:
+    """show_many URLs in 100-id batches; one join per batch, commas stay literal, anything else is escaped."""
+    extra = {"include": include} if include else {}
+    return [
+        f"{base}/tickets/show_many.json?{urlencode({'ids': ','.join(ids[i:i+100]), **extra}, safe=',')}"
+        for i in range(0, len(ids), 100)
+    ]
+
+
+def _map_batches(fetch, urls: List[str]) -> List[Any]:
+    """Runs `fetch` over independent batch URLs on the shared pool; results keep request order."""
+    if len(urls) == 1:
+        return [fetch(urls[0])]
+    with ThreadPoolExecutor(max_workers=min(len(urls), SHOW_MANY_MAX_WORKERS)) as pool:
+        return list(pool.map(fetch, urls))
+
+
 def show_many(ticket_ids: Iterable[str]) -> List[Dict[str, Any]]:
     config = _get_config() # <-- Get config at runtime
     BASE = config['base_url']
@@ -100,17 +259,10 @@ def show_many(ticket_ids: Iterable[str]) -> List[Dict[str, Any]]:
     ids = [s for s in ticket_ids if s.isdigit()]
     if not ids:
         return []
-    out: List[Dict[str, Any]] = []
     logger.info(f"Fetching {len(ids)} tickets via show_many")
-    for i in range(0, len(ids), 100):
-        q = ",".join(ids[i:i+100])
-        url = f"{BASE}/tickets/show_many.json?ids={q}"
-        logger.debug(f"GET {url}")
-        r = _retry(requests.get, url, auth=_auth(), timeout=30)
-        tickets = r.json().get("tickets", [])
-        logger.debug(f"Fetched {len(tickets)} tickets in batch {i//100+1}")
-        out.extend(tickets)
-    return out
+    # Batches are independent GETs: fan out, then flatten in request order
+    pages = _map_batches(_fetch_tickets_page, _show_many_urls(BASE, ids))
+    return [t for page in pages for t in page]
 
 
 def search_by_groups_and_statuses(group_ids: Optional[List[str]], statuses: Optional[List[str]]) -> List[Dict[str, Any]]:
@@ -125,13 +277,14 @@ def search_by_groups_and_statuses(group_ids: Optional[List[str]], statuses: Opti
         q.append("(" + " OR ".join([f"status:{s}" for s in statuses if s]) + ")")
     query = " ".join(q) if q else "type:ticket"
 
-    url = f"{BASE}/search.json?query={requests.utils.quote(query)}&per_page=100"
+    # Encoded once; later pages come from Zendesk's next_page, which already carries the query
+    url = f"{BASE}/search.json?{urlencode({'query': query, 'per_page': 100}, quote_via=quote)}"
     logger.info(f"Searching tickets: {query}")
     out: List[Dict[str, Any]] = []
     while url:
+        # Zendesk drives pagination: next_page is requested verbatim until it is None
         logger.debug(f"GET {url}")
-        r = _retry(requests.get, url, auth=_auth(), timeout=30)
-        data = r.json()
+        data = _retry("GET", url, timeout=30).json()
         results = data.get("results", [])
         logger.debug(f"Fetched {len(results)} results in search page")
         out.extend(results)
@@ -161,7 +314,7 @@ def update_ticket(ticket_id: int, **fields) -> Dict[str, Any]:
     
     url = f"{BASE}/tickets/{ticket_id}.json"
     logger.info(f"Updating ticket {ticket_id} with {fields}")
-    r = _retry(requests.put, url, auth=_auth(), json={"ticket": fields}, timeout=30)
+    r = _retry("PUT", url, json={"ticket": fields}, timeout=30)
     ticket = r.json()["ticket"]
     logger.debug(f"Ticket {ticket_id} updated → status={ticket.get('status')}, assignee_id={ticket.get('assignee_id')}, group_id={ticket.get('group_id')}")
     return ticket
@@ -174,7 +327,7 @@ def add_comment(ticket_id: int, body: str, public: bool = False) -> Dict[str, An
     url = f"{BASE}/tickets/{ticket_id}.json"
     payload = {"ticket": {"comment": {"body": body, "public": public}}}
     logger.info(f"Adding {'public' if public else 'internal'} comment to ticket {ticket_id}")
-    r = _retry(requests.put, url, auth=_auth(), json=payload, timeout=30)
+    r = _retry("PUT", url, json=payload, timeout=30)
     ticket = r.json()["ticket"]
     logger.debug(f"Comment added to ticket {ticket_id}")
     return ticket
@@ -184,15 +337,34 @@ def add_comment(ticket_id: int, body: str, public: bool = False) -> Dict[str, An
 # Metrics
 # -------------------
 
-def get_metrics_solved_at(ticket_id: int) -> Optional[str]:
+_TERMINAL_STATUSES = frozenset({"solved", "closed"})
+ENRICH_MAX_WORKERS = 8
+
+# Resolved timestamps keyed by ticket id -> (updated_at, resolved_at). Any ticket change (reopen,
+# re-solve) bumps updated_at, so an entry is only served while updated_at still matches — even when
+# the reopened ticket never shows up in a later (e.g. statuses=solved) status map. Only non-empty
+# resolutions are stored, and the LRU bound applies to the whole cache.
+_RESOLUTION_CACHE_SIZE = 4096
+_resolution_cache: "OrderedDict[Any, tuple]" = OrderedDict()
+_resolution_cache_lock = threading.Lock()
+
+
+def _fetch_metric_sets(url: str) -> List[Dict[str, Any]]:
+    r = _retry("GET", url, timeout=30)
+    return r.json().get("metric_sets", [])
+
+
+def get_metrics_many(ticket_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+    """Batch solved_at lookup: show_many with the metric_sets sideload, 100 ids per request."""
     config = _get_config() # <-- Get config at runtime
     BASE = config['base_url']
-    
-    url = f"{BASE}/tickets/{ticket_id}/metrics.json"
-    logger.debug(f"Fetching metrics for ticket {ticket_id}")
-    r = _retry(requests.get, url, auth=_auth(), timeout=30)
-    m = r.json().get("ticket_metric") or {}
-    return m.get("solved_at")
+
+    ids = [str(t) for t in ticket_ids]
+    if not ids:
+        return {}
+    logger.debug(f"Fetching metrics for {len(ids)} tickets via show_many")
+    pages = _map_batches(_fetch_metric_sets, _show_many_urls(BASE, ids, include="metric_sets"))
+    return {m.get("ticket_id"): m.get("solved_at") for page in pages for m in page}
 
 
 def get_last_resolution_from_audits(ticket_id: int) -> Optional[str]:
@@ -203,14 +375,14 @@ def get_last_resolution_from_audits(ticket_id: int) -> Optional[str]:
     last = None
     logger.debug(f"Scanning audits for ticket {ticket_id}")
     while url:
-        r = _retry(requests.get, url, auth=_auth(), timeout=30)
+        r = _retry("GET", url, timeout=30)
         data = r.json() or {}
         for audit in data.get("audits", []):
             when = audit.get("created_at")
             for ev in audit.get("events", []):
                 if isinstance(ev, dict) and ev.get("type") == "Change" and ev.get("field") == "status":
                     val = (ev.get("value") or "").lower()
-                    if val in {"solved", "closed"}:
+                    if val in _TERMINAL_STATUSES:
                         last = when
             url = data.get("next_page")
             time.sleep(0.1)
@@ -219,39 +391,95 @@ def get_last_resolution_from_audits(ticket_id: int) -> Optional[str]:
     return last
 
 
+def _cached_resolution(tid: Any, updated_at: Optional[str]) -> Optional[str]:
+    """Cached resolved_at for `tid`, only if the ticket has not changed since it was stored."""
+    if not updated_at:
+        return None
+    with _resolution_cache_lock:
+        entry = _resolution_cache.get(tid)
+        if entry is None or entry[0] != updated_at:
+            return None
+        _resolution_cache.move_to_end(tid)
+        return entry[1]
+
+
+def _remember_resolution(tid: Any, updated_at: Optional[str], resolved_at: Optional[str]) -> None:
+    if not (updated_at and resolved_at):
+        return
+    with _resolution_cache_lock:
+        _resolution_cache[tid] = (updated_at, resolved_at)
+        _resolution_cache.move_to_end(tid)
+        while len(_resolution_cache) > _RESOLUTION_CACHE_SIZE:
+            _resolution_cache.popitem(last=False)
+
+
+def _clear_resolution_caches() -> None:
+    with _resolution_cache_lock:
+        _resolution_cache.clear()
+
+
+def _intern_status(status: Any) -> Any:
+    """Interns status strings so terminal-status checks in enrich hit the identity fast path."""
+    return sys.intern(status) if isinstance(status, str) else status
+
+
 def build_status_map(tickets: List[Dict[str, Any]]) -> Dict[int, Dict[str, str]]:
-    m: Dict[int, Dict[str, str]] = {}
     logger.debug(f"Building status map for {len(tickets)} tickets")
-    for t in tickets:
-        tid = t.get("id")
-        if not isinstance(tid, int) and isinstance(tid, str) and tid.isdigit():
-            tid = int(tid)
-        if not isinstance(tid, int):
-            continue
-        m[tid] = {"status": t.get("status", ""), "updated_at": t.get("updated_at", "")}
-    return m
+    # Single pass; int ids pass straight through, numeric strings are coerced, anything else is dropped
+    return {
+        int(tid): {"status": _intern_status(t.get("status", "")), "updated_at": t.get("updated_at", "")}
+        for t in tickets
+        for tid in (t.get("id"),)
+        if isinstance(tid, int) or (isinstance(tid, str) and tid.isdigit())
+    }
+
+
+def _audit_resolution(tid: Any) -> Optional[str]:
+    """Audit fallback for one ticket; failures are logged, not raised."""
+    try:
+        return get_last_resolution_from_audits(tid)
+    except Exception as e:
+        logger.warning(f"Audit fetch failed for {tid}: {e}")
+        return None
 
 
 def enrich_with_resolution_times(status_map: Dict[int, Dict[str, str]]) -> None:
+    """Adds resolved_at to solved/closed entries of a build_status_map (int-keyed) map."""
     logger.debug(f"Enriching {len(status_map)} tickets with resolution times")
-    for tid, info in list(status_map.items()):
-        st = (info.get("status") or "").lower()
-        if st not in {"solved", "closed"}:
-            continue
-        solved = None
-        try:
-            solved = get_metrics_solved_at(tid)
-        except Exception as e:
-            logger.warning(f"Metrics fetch failed for {tid}: {e}")
-            solved = None
-        if not solved:
-            try:
-                solved = get_last_resolution_from_audits(tid)
-            except Exception as e:
-                logger.warning(f"Audit fetch failed for {tid}: {e}")
-                solved = None
+    # Only terminal tickets carry a resolution; everything else is filtered out in one pass
+    # Interned lowercase statuses match on identity; .lower() is only paid on a miss
+    resolved = [
+        (tid, info) for tid, info in status_map.items()
+        for status in (info.get("status") or "",)
+        if status in _TERMINAL_STATUSES or status.lower() in _TERMINAL_STATUSES
+    ]
+    pending = []
+    for tid, info in resolved:
+        cached = _cached_resolution(tid, info.get("updated_at"))
+        if cached:
+            info["resolved_at"] = cached
+        else:
+            pending.append((tid, info))
+    resolved = pending
+    if not resolved:
+        return
+    try:
+        metrics = get_metrics_many([tid for tid, _ in resolved])
+    except Exception as e:
+        logger.warning(f"Batch metrics fetch failed for {len(resolved)} tickets: {e}")
+        metrics = {}
+    # Audit fallbacks are independent per ticket, so they fan out over the shared session pool
+    missing = [tid for tid, _ in resolved if not metrics.get(tid)]
+    audited: Dict[Any, Optional[str]] = {}
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), ENRICH_MAX_WORKERS)) as pool:
+            audited = dict(zip(missing, pool.map(_audit_resolution, missing)))
+    # Results are written back on the calling thread only
+    for tid, info in resolved:
+        solved = metrics.get(tid) or audited.get(tid)
         if solved:
             info["resolved_at"] = solved
+            _remember_resolution(tid, info.get("updated_at"), solved)
             logger.debug(f"Ticket {tid} resolved_at={solved}")
 
 
@@ -266,7 +494,7 @@ def get_user(user_id: int) -> Optional[Dict[str, Any]]:
     """Fetch one user by ID (for reassignment enrichment)."""
     url = f"{BASE}/users/{user_id}.json"
     logger.debug(f"Fetching user {user_id}")
-    r = _retry(requests.get, url, auth=_auth(), timeout=30)
+    r = _retry("GET", url, timeout=30)
     u = r.json().get("user")
     if not u:
         return None
@@ -283,7 +511,7 @@ def list_oaps_users() -> List[Dict[str, Any]]:
     out: List[Dict[str, Any]] = []
     while url:
         logger.debug(f"GET {url}")
-        r = _retry(requests.get, url, auth=_auth(), timeout=30)
+        r = _retry("GET", url, timeout=30)
         data = r.json()
         for u in data.get("users", []):
             if not OAPS_GROUP_IDS or str(u.get("group_id")) in OAPS_GROUP_IDS:
@@ -315,7 +543,7 @@ def get_last_comments(ticket_id: int, limit: int = 3) -> List[Dict[str, Any]]:
 
     url = f"{BASE}/tickets/{ticket_id}/comments.json?per_page={max(1, min(limit, 100))}"
     logger.debug(f"Fetching last {limit} comments for ticket {ticket_id}")
-    r = _retry(requests.get, url, auth=_auth(), timeout=30)
+    r = _retry("GET", url, timeout=30)
     data = r.json() or {}
     comments = data.get("comments", [])
     # Ensure we only return up to 'limit' comments, preferring most recent
@@ -340,22 +568,23 @@ def get_last_comments(ticket_id: int, limit: int = 3) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------------------------------
 # ✅ Legacy Compatibility Layer (for tests or legacy middleware)
 # ---------------------------------------------------------------------------------
-try:
-    _legacy_cfg = _get_config()
-    ZENDESK_API_URL = _legacy_cfg.get("base_url")
-    ZENDESK_SUBDOMAIN = _legacy_cfg.get("subdomain")
-    ZENDESK_EMAIL = _legacy_cfg.get("email")
-    ZENDESK_API_TOKEN = _legacy_cfg.get("token")
-    OAPS_GROUP_IDS = _legacy_cfg.get("oaps_group_ids")
-except Exception as e:
-    # Ensure import never fails in tests, even if env not loaded
-    logger.warning(f"Zendesk legacy constants not initialized: {e}")
-    ZENDESK_API_URL = None
-    ZENDESK_SUBDOMAIN = None
-    ZENDESK_EMAIL = None
-    ZENDESK_API_TOKEN = None
-    OAPS_GROUP_IDS = []
-
+# Resolved from the current config on attribute access (PEP 562), so importing this module never
+# reads the environment and the values track reload_config(). To override them in tests, patch
+# _get_config: monkeypatching the names directly would pin a real attribute after undo.
+_LEGACY_CONFIG_ATTRS = {
+    "ZENDESK_API_URL": "base_url",
+    "ZENDESK_SUBDOMAIN": "subdomain",
+    "ZENDESK_EMAIL": "email",
+    "ZENDESK_API_TOKEN": "token",
+    "OAPS_GROUP_IDS": "oaps_group_ids",
+}
+
+
+def __getattr__(name: str) -> Any:
+    key = _LEGACY_CONFIG_ATTRS.get(name)
+    if key is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _get_config().get(key)
 
 
 # ---------------------------------------------------------------------------------
@@ -30,25 +30,32 @@ from fastapi.testclient import TestClient
 # 🔒 Early Environment Lock (Absolute First Step)
 # =================================================================================================
 
-if not os.getenv("PYTEST_ENV_LOCKED"):
-    def _detect_test_mode() -> str:
-        """Detect whether pytest was invoked for unit or integration tests."""
-        args = " ".join(sys.argv).lower()
-        if "tests/integration" in args or "tests\\integration" in args:
-            return "integration"
-        return "unit"
-
+def _detect_test_mode() -> str:
+    """Detect whether pytest was invoked for unit or integration tests."""
+    args = " ".join(sys.argv).lower()
+    if "tests/integration" in args or "tests\\integration" in args:
+        return "integration"
+    return "unit"
+
+def _bootstrap_env() -> None:
+    """Apply the whole test-mode environment in a single os.environ.update (once per process)."""
     mode = _detect_test_mode()
     print(f"🧩 [Bootstrap] Resolving environment from path → {mode.upper()}")
 
-    # Apply environment
-    os.environ.update({
+    env = {
         "APP_ENV": mode,
         "UNIT_MODE": "1" if mode == "unit" else "0",
         "INTEGRATION_MODE": "1" if mode == "integration" else "0",
         "PYTEST_ENV_LOCKED": "1",
         "PYTEST_INTEGRATION_OVERRIDE": "1" if mode == "integration" else "0",
-    })
+    }
+    # Default token for unit middleware tests (previously set per test module)
+    if mode == "unit" and "ZENDESK_API_TOKEN" not in os.environ:
+        env["ZENDESK_API_TOKEN"] = "valid-token"
+    os.environ.update(env)
+
+if not os.getenv("PYTEST_ENV_LOCKED"):
+    _bootstrap_env()
 
 print(f"🔐 [Env Locked] APP_ENV={os.getenv('APP_ENV')} | UNIT_MODE={os.getenv('UNIT_MODE')} | INTEGRATION_MODE={os.getenv('INTEGRATION_MODE')}")
 
@@ -108,9 +115,11 @@ if UNIT_MODE == "1":
 # -------------------------------------------------------------------------------------------------
 # 🌐 Import app AFTER environment setup
 # -------------------------------------------------------------------------------------------------
-from backend.main import app as base_app
+from backend.main import get_app
 from backend.config import get_settings
 
+base_app = get_app()
+
 # -------------------------------------------------------------------------------------------------
 # 🌍 Environment Summary Banner
 # -------------------------------------------------------------------------------------------------
@@ -164,6 +173,11 @@ def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item
 def console_fixture() -> Console:
     return console
 
+@pytest.fixture(scope="session")
+def app():
+    """The memoized application imported above; tests take this instead of importing backend.main."""
+    return base_app
+
 if INTEGRATION_MODE != "1":
     @pytest.fixture(scope="session")
     def mock_zendesk_service(monkeypatch):
@@ -173,9 +187,13 @@ if INTEGRATION_MODE != "1":
 
     @pytest.fixture(scope="session")
     def test_client():
-        client = TestClient(base_app)
-        yield client
-        client.close()
+        with TestClient(base_app) as client:
+            yield client
+
+    @pytest.fixture(scope="session")
+    def client(test_client):
+        """Session-wide TestClient shared by every test module (nearest `test_client` wins)."""
+        return test_client
 
 
 
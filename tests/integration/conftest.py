@@ -112,10 +112,13 @@ def mock_external_services(monkeypatch):
         lambda url, name: True,
     )
 
-    # ✅ Mock Zendesk Base URL
+    # ✅ Mock Zendesk Base URL (via the config; ZENDESK_API_URL is resolved lazily from it)
+    from backend.services import zendesk_service
+    real_config = zendesk_service._load_config
     monkeypatch.setattr(
-        "backend.services.zendesk_service.ZENDESK_API_URL",
-        "https://mock.zendesk/api/v2",
+        zendesk_service,
+        "_get_config",
+        lambda: {**real_config(), "base_url": "https://mock.zendesk/api/v2"},
     )
 
     yield
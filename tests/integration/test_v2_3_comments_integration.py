@@ -1,10 +1,9 @@
 # Phase 3 integration-ish check for comments endpoint using monkeypatch
 
 from fastapi.testclient import TestClient
-from backend.main import app
 
 
-def test_v2_3_comments_endpoint_works_with_stub(monkeypatch):
+def test_v2_3_comments_endpoint_works_with_stub(monkeypatch, app):
     # Ensure middleware accepts the test token in integration mode
     monkeypatch.setenv("API_AUTH_TOKEN", "test-token")
     def _stub(ticket_id: int, limit: int = 3):
@@ -1,10 +1,9 @@
 # Phase 3 integration-ish check for last export endpoint
 
 from fastapi.testclient import TestClient
-from backend.main import app
 
 
-def test_v2_3_export_last_default_path(monkeypatch, tmp_path):
+def test_v2_3_export_last_default_path(monkeypatch, tmp_path, app):
     # Point metadata path to a temp file to avoid cross-test interference
     monkeypatch.setenv("EXPORT_META_PATH", str(tmp_path / "export_meta.json"))
     # Ensure middleware accepts the test token in integration mode
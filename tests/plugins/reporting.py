@@ -14,6 +14,7 @@
 # =================================================================================================
 
 import os
+import re
 import time
 import json
 import socket
@@ -66,6 +67,24 @@ _global_totals = {"passed": 0, "failed": 0, "skipped": 0}
 _suite_start_time = time.time()
 _slowest_test = {"name": None, "duration": 0.0}
 
+# Keyword → latency group (single compiled scan per test name). When a name holds several
+# keywords, the fixed priority below decides (tickets, then users, then export), not position.
+_GROUP_RE = re.compile(r"ticket|user|export", re.IGNORECASE)
+_GROUP_PRIORITY = (("ticket", "tickets"), ("user", "users"), ("export", "export"))
+
+
+def _latency_group(test_name: str) -> str:
+    found = {m.lower() for m in _GROUP_RE.findall(test_name)}
+    return next((group for keyword, group in _GROUP_PRIORITY if keyword in found), "misc")
+
+def _new_results_table() -> Table:
+    """Fresh 3-column results table per module (public Rich API only)."""
+    table = Table(show_header=True, header_style="bold white")
+    table.add_column("Test", style="white", no_wrap=True)
+    table.add_column("Status", justify="center", width=10)
+    table.add_column("Details", justify="left")
+    return table
+
 # ---------------------------------------------------------------------------------------------
 # 🌐 Environment Diagnostics
 # ---------------------------------------------------------------------------------------------
@@ -118,15 +137,7 @@ def pytest_runtest_logreport(report):
         _slowest_test.update({"name": test_name, "duration": duration})
 
     # Categorize by keyword for group latency metrics
-    group = "misc"
-    name_lower = test_name.lower()
-    if "ticket" in name_lower:
-        group = "tickets"
-    elif "user" in name_lower:
-        group = "users"
-    elif "export" in name_lower:
-        group = "export"
-    _latency_by_group[group].append(duration)
+    _latency_by_group[_latency_group(test_name)].append(duration)
 
     # Outcome handling
     if report.outcome == "failed":
@@ -167,11 +178,8 @@ def pytest_sessionfinish(session, exitstatus):
         rel_path = os.path.relpath(module_path, os.getcwd())
         console.rule(f"[bold cyan]{rel_path} Results[/bold cyan]")
 
-        # 3-column table setup
-        table = Table(show_header=True, header_style="bold white")
-        table.add_column("Test", style="white", no_wrap=True)
-        table.add_column("Status", justify="center", width=10)
-        table.add_column("Details", justify="left")
+        # 3-column table
+        table = _new_results_table()
 
         passed = failed = skipped = 0
 
@@ -7,34 +7,50 @@
 #   - Forces UNIT_MODE=1 (no network calls).
 #   - Ensures APP_ENV=test unless overridden.
 #   - Automatically injects a valid Authorization header for all test requests.
-#   - Provides rich console test boundaries for local visibility.
+#   - Shares one sync TestClient and one httpx.AsyncClient (ASGITransport) per session.
+#   - Provides rich console test boundaries for local visibility (opt-in: UNIT_RICH_LOG=1).
 #
 # Author: Olivier Lamy | October 2025
 # =================================================================================================
 
 import os
+import asyncio
 import traceback
+from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
+import httpx
 import pytest
-from rich.console import Console
-from rich.traceback import install
-from rich.rule import Rule
 from fastapi.testclient import TestClient
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 
 # -------------------------------------------------------------------------------------------------
 # 🧭 Environment Enforcement
 # -------------------------------------------------------------------------------------------------
-os.environ["APP_ENV"] = "unit"
-os.environ["UNIT_MODE"] = "1"
-os.environ["INTEGRATION_MODE"] = "0"
+_UNIT_ENV = {"APP_ENV": "unit", "UNIT_MODE": "1", "INTEGRATION_MODE": "0"}
+# Root conftest's _bootstrap_env() normally set these already; only write on mismatch
+if any(os.environ.get(k) != v for k, v in _UNIT_ENV.items()):
+    os.environ.update(_UNIT_ENV)
 print(" [UNIT MODE] Enforced - Zendesk API/network calls disabled.")
 
 # -------------------------------------------------------------------------------------------------
 # 🧱 Console + Traceback Setup
 # -------------------------------------------------------------------------------------------------
-console = Console()
-install(show_locals=True)
+# Per-test Rich boundaries + failure tracebacks are opt-in (UNIT_RICH_LOG=1)
+RICH_TEST_LOGS = os.getenv("UNIT_RICH_LOG", "0") == "1"
+
+@lru_cache(maxsize=1)
+def _lazy_rich() -> SimpleNamespace:
+    """Import Rich and pre-build boundary renderables on first use (opt-in path only)."""
+    from rich.console import Console
+    from rich.rule import Rule
+    from rich.text import Text
+
+    return SimpleNamespace(
+        console=Console(),
+        rule_blue=Rule(style="bold blue"),
+        rule_red=Rule(style="bold red"),
+        start_text=Text.from_markup("[bold blue]TEST START"),
+        end_text=Text.from_markup("[bold red]TEST END"),
+    )
 
 def _debug(msg: str):
     print(f" [UNIT-CONFTEST] {msg}")
@@ -44,14 +60,20 @@ _debug("Unit-level conftest.py loaded.")
 # -------------------------------------------------------------------------------------------------
 # 🧩 Authorization Injection Middleware
 # -------------------------------------------------------------------------------------------------
-class _InjectAuthHeaderMiddleware(BaseHTTPMiddleware):
-    """Middleware that injects a valid Authorization header during unit tests."""
-    async def dispatch(self, request: Request, call_next):
-        headers = request.scope.get("headers", [])
-        if not any(h[0] == b"authorization" for h in headers):
-            headers.append((b"authorization", b"Bearer valid-token"))
-            request.scope["headers"] = headers
-        return await call_next(request)
+class _InjectAuthHeaderMiddleware:
+    """Pure ASGI middleware that injects a valid Authorization header during unit tests."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = scope.setdefault("headers", [])
+            for name, _ in headers:
+                if name == b"authorization":
+                    break
+            else:
+                headers.append((b"authorization", b"Bearer valid-token"))
+        await self.app(scope, receive, send)
 
 # -------------------------------------------------------------------------------------------------
 # 🧹 Cache Cleaner
@@ -71,6 +93,8 @@ def pytest_sessionstart(session):
         _clean_caches_for_unit_run()
         print(" [Clean] Cleared caches for unit test run.")
         print(" [UNIT-CONFTEST] Finished cleaning caches successfully.")
+        # Pre-warm the settings cache so the first test doesn't pay .env parsing inline
+        get_settings()
     except Exception as e:
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         print("FATAL ERROR IN UNIT CONFTEST SETUP - EXECUTION ABORTED")
@@ -79,11 +103,24 @@ def pytest_sessionstart(session):
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         raise
 
+def pytest_exception_interact(node, call, report):
+    """Render a Rich locals traceback for failing tests only, instead of a global excepthook."""
+    if not RICH_TEST_LOGS or call.excinfo is None:
+        return
+    from rich.traceback import Traceback
+
+    excinfo = call.excinfo
+    _lazy_rich().console.print(
+        Traceback.from_exception(excinfo.type, excinfo.value, excinfo.tb, show_locals=True)
+    )
+
 # -------------------------------------------------------------------------------------------------
 # 🌐 App Import (after env setup)
 # -------------------------------------------------------------------------------------------------
 from backend.main import app as base_app
 from backend.config import get_settings
+from backend.services import zendesk_service, sharepoint_service, email_service
+from backend.utils import helpers
 
 # Add the auth-injection middleware before any client is created
 base_app.add_middleware(_InjectAuthHeaderMiddleware)
@@ -98,9 +135,6 @@ def settings():
 @pytest.fixture(scope="session")
 def test_client():
     """Provides a FastAPI TestClient with injected Authorization header."""
-    os.environ["UNIT_MODE"] = "1"
-    os.environ["INTEGRATION_MODE"] = "0"
-
     client = TestClient(base_app)
     # Ensure requests made through client also carry auth header
     try:
@@ -111,30 +145,105 @@ def test_client():
     yield client
     client.close()
 
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run `@pytest.mark.anyio` tests on asyncio only."""
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+def async_client():
+    """Session-wide httpx.AsyncClient driving the app in-process via ASGITransport."""
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=base_app),
+        base_url="http://test",
+        headers={"Authorization": "Bearer valid-token"},
+    )
+    yield client
+    asyncio.run(client.aclose())
+
+# Canonical bearer credentials for tests that exercise the real auth path
+_AUTH_TOKEN = "test-token"
+AUTH_HEADERS = MappingProxyType({"Authorization": f"Bearer {_AUTH_TOKEN}"})
+
+@pytest.fixture
+def auth_headers(monkeypatch):
+    """Read-only Authorization header; API_AUTH_TOKEN is set to match for the test."""
+    monkeypatch.setenv("API_AUTH_TOKEN", _AUTH_TOKEN)
+    return AUTH_HEADERS
+
+# Attribute → owning module for every call the export flow makes; each is routed through `export_stubs`
+_EXPORT_STUB_TARGETS = {
+    "search_by_groups_and_statuses": zendesk_service,
+    "build_status_map": zendesk_service,
+    "enrich_with_resolution_times": zendesk_service,
+    "make_ticket_workbook": helpers,
+    "upload_bytes": sharepoint_service,
+    "send_directors_export_link": email_service,
+}
+
+@pytest.fixture
+def export_stubs(monkeypatch, tmp_path):
+    """
+    Happy-path stubs for the export flow. Returns the namespace of stub callables;
+    tests override only the failing step, e.g. `export_stubs.upload_bytes = boom`.
+    """
+    stubs = SimpleNamespace(
+        search_by_groups_and_statuses=lambda *a, **k: [
+            {"id": 1, "status": "open", "subject": "Test", "created_at": "2025-09-01T00:00:00"}
+        ],
+        build_status_map=lambda tickets: {1: {"status": "open"}},
+        enrich_with_resolution_times=lambda status_map: None,
+        make_ticket_workbook=lambda rows: (b"bytes", "unit-export.xlsx"),
+        upload_bytes=lambda name, data: "https://sharepoint.example.com/unit-export.xlsx",
+        send_directors_export_link=lambda url, name: True,
+    )
+    for name, module in _EXPORT_STUB_TARGETS.items():
+        # Late-bound dispatch so reassigning an attribute on `stubs` takes effect immediately
+        monkeypatch.setattr(module, name, lambda *a, _n=name, **k: getattr(stubs, _n)(*a, **k))
+    monkeypatch.setenv("EXPORT_META_PATH", str(tmp_path / "export_meta.json"))
+    return stubs
+
+@pytest.fixture(autouse=True)
+def clear_resolution_caches():
+    """Every test starts and ends with an empty resolution cache, even when an assertion fails."""
+    zendesk_service._clear_resolution_caches()
+    yield
+    zendesk_service._clear_resolution_caches()
+
 @pytest.fixture(autouse=True)
 def rich_test_logging():
-    console.print(Rule(style="bold blue"))
-    console.print("[bold blue]TEST START")
+    if not RICH_TEST_LOGS:
+        yield
+        return
+    rich = _lazy_rich()
+    rich.console.print(rich.rule_blue, highlight=False)
+    rich.console.print(rich.start_text, highlight=False)
     yield
-    console.print("[bold red]TEST END")
-    console.print(Rule(style="bold red"))
+    rich.console.print(rich.end_text, highlight=False)
+    rich.console.print(rich.rule_red, highlight=False)
 
 # -------------------------------------------------------------------------------------------------
 # 🚫 Disable auth injection for SecurityMiddleware tests
 # -------------------------------------------------------------------------------------------------
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def disable_auth_injection_for_security_tests(request):
     """
     For test files named `test_security_middleware.py`, remove the injected Authorization header
-    so we can properly test 401/403 behavior.
+    so we can properly test 401/403 behavior. Runs once per module and restores on teardown.
     """
-    if "test_security_middleware" in str(request.fspath):
-        print(" [UNIT-CONFTEST] Disabling injected auth for security middleware tests.")
-        # Temporarily remove the injected middleware
-        from backend.main import app as base_app
-        base_app.user_middleware = [
-            m for m in base_app.user_middleware
-            if m.cls.__name__ != "_InjectAuthHeaderMiddleware"
-        ]
+    if "test_security_middleware" not in str(request.fspath):
+        yield
+        return
+
+    print(" [UNIT-CONFTEST] Disabling injected auth for security middleware tests.")
+    if not hasattr(base_app, "_orig_user_middleware"):
+        base_app._orig_user_middleware = list(base_app.user_middleware)
+    base_app.user_middleware = [
+        m for m in base_app._orig_user_middleware
+        if m.cls.__name__ != "_InjectAuthHeaderMiddleware"
+    ]
+    # Starlette caches the built stack after the first request; force a rebuild
+    base_app.middleware_stack = None
     yield
-
+    base_app.user_middleware = list(base_app._orig_user_middleware)
+    base_app.middleware_stack = None
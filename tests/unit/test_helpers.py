@@ -3,10 +3,13 @@
 # Description: Unit tests for utils/helpers.py
 # =====================================================================
 
+import io
+import zipfile
+from xml.etree import ElementTree
 import pytest
 from backend.utils import helpers
-import openpyxl
 
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
 
 
 def test_compute_meeting_window(monkeypatch):
@@ -38,15 +41,31 @@ def test_fill_color_for_age_valid_and_invalid():
     assert helpers._fill_color_for_age("Invalid Age") is None
 
 
-def test_make_ticket_workbook_smoke(tmp_path):
+def _first_row_values(zf: zipfile.ZipFile) -> list:
+    """Header cell strings of the first sheet, resolving inline and shared strings."""
+    shared = []
+    if "xl/sharedStrings.xml" in zf.namelist():
+        sst = ElementTree.fromstring(zf.read("xl/sharedStrings.xml"))
+        shared = ["".join(t.text or "" for t in si.iter(f"{_XLSX_NS}t")) for si in sst.iter(f"{_XLSX_NS}si")]
+    sheet = ElementTree.fromstring(zf.read("xl/worksheets/sheet1.xml"))
+    row = next(sheet.iter(f"{_XLSX_NS}row"))
+    values = []
+    for cell in row.iter(f"{_XLSX_NS}c"):
+        if cell.get("t") == "s":
+            values.append(shared[int(cell.find(f"{_XLSX_NS}v").text)])
+        else:
+            values.append("".join(t.text or "" for t in cell.iter(f"{_XLSX_NS}t")))
+    return values
+
+
+def test_make_ticket_workbook_smoke():
     rows = [
         {"id": 1, "subject": "Test", "group": "A", "status": "open",
          "assignee_id": 123, "assignee_name": "Tester",
          "ageBucket": "Over 10 Days", "ageDays": 15, "closedByMeeting": False}
     ]
     data, filename = helpers.make_ticket_workbook(rows)
-    out = tmp_path / filename
-    out.write_bytes(data)
-    wb = openpyxl.load_workbook(out)
-    assert "Ticket Breakdown" in "".join(wb.sheetnames)
-    assert "Ticket Age (Days)" in [cell.value for cell in wb.active[1]]
\ No newline at end of file
+    # Inspect the XLSX package in memory instead of loading a full openpyxl workbook
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert b"Ticket Breakdown" in zf.read("xl/workbook.xml")
+        assert "Ticket Age (Days)" in _first_row_values(zf)
@@ -14,44 +14,46 @@
 # Scope:
 #   - Verifies successful app creation.
 #   - Confirms `/` health check returns expected response.
-#   - Ensures `.env` configuration is loadable via get_settings().
+#   - Ensures `.env` configuration is loadable via Settings().
 #   - Confirms routers for Tickets and Users are registered under v2 paths.
 #
 # Author: Olivier Lamy
 # Version: 2.0.0 | October 2025
 # =================================================================================================
 
-import pytest
+import json
 from fastapi.testclient import TestClient
-from backend.main import app
 from backend.config import get_settings
-from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi import FastAPI, status
-from fastapi.responses import JSONResponse
 
-class ExceptionPassthroughMiddleware(BaseHTTPMiddleware):
-    """Middleware that ensures exceptions bubble up to the app’s handler in isolated test apps."""
-    async def dispatch(self, request, call_next):
-        try:
-            return await call_next(request)
-        except Exception as exc:
-            # Let FastAPI’s handler catch it instead of re-raising
-            from fastapi.requests import Request
-            from fastapi.responses import JSONResponse
-            from fastapi import status
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"error": str(exc), "path": request.url.path},
-            )
+class ExceptionPassthroughMiddleware:
+    """Pure ASGI wrapper turning uncaught route exceptions into a JSON 500 in isolated test apps."""
+    def __init__(self, app):
+        self.app = app
 
-# ---------------------------------------------------------------------------------------------
-# 📦 Fixtures
-# ---------------------------------------------------------------------------------------------
-@pytest.fixture(scope="module")
-def client():
-    """Fixture providing a FastAPI TestClient instance for integration-style testing."""
-    return TestClient(app)
+    async def __call__(self, scope, receive, send):
+        started = False
 
+        async def _send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        except Exception as exc:
+            if started or scope["type"] != "http":
+                raise
+            await send({
+                "type": "http.response.start",
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "headers": [(b"content-type", b"application/json")],
+            })
+            await send({
+                "type": "http.response.body",
+                "body": json.dumps({"error": str(exc), "path": scope["path"]}).encode(),
+            })
 
 # ---------------------------------------------------------------------------------------------
 # 🩺 Health Check Endpoint
@@ -68,7 +70,7 @@ def test_health_check_returns_ok(client):
 # ---------------------------------------------------------------------------------------------
 # ⚙️ App Initialization
 # ---------------------------------------------------------------------------------------------
-def test_app_title_and_version():
+def test_app_title_and_version(app):
     """Confirm that the FastAPI app initializes with the correct title and version metadata."""
     assert app.title == "OAPS Zendesk App"
     assert app.version.startswith("2.0"), "App version should reflect current release cycle (v2.x)"
@@ -78,12 +80,13 @@ def test_app_title_and_version():
 # ---------------------------------------------------------------------------------------------
 # 🌐 Router Registration
 # ---------------------------------------------------------------------------------------------
-def test_router_prefixes_registered():
+def test_router_prefixes_registered(app):
     """Ensure Tickets and Users routers are properly registered under both v1 and v2 paths."""
-    routes = [r.path for r in app.routes]
+    # Parent path of every route, built once → O(R + P) membership checks
+    prefix_set = {r.path.rsplit("/", 1)[0] for r in app.routes}
     expected_prefixes = ["/api/tickets", "/api/users", "/api/v2/tickets", "/api/v2/users"]
     for prefix in expected_prefixes:
-        assert any(prefix in route for route in routes), f"Expected route prefix {prefix} not found"
+        assert prefix in prefix_set, f"Expected route prefix {prefix} not found"
 
 
 # ---------------------------------------------------------------------------------------------
@@ -91,8 +94,9 @@ def test_router_prefixes_registered():
 # ---------------------------------------------------------------------------------------------
 def test_environment_loads_successfully(monkeypatch):
     """
-    Validate that environment variables load correctly and get_settings() works as expected.
-    Resets cached settings to ensure fresh reads per environment.
+    Validate that environment variables load correctly into Settings.
+    Builds a fresh Settings() instead of clearing the shared get_settings() cache,
+    so later tests keep the pre-warmed instance.
     """
     # Arrange
     from backend import config
@@ -100,12 +104,8 @@ def test_environment_loads_successfully(monkeypatch):
     monkeypatch.setenv("DEBUG", "true")
     monkeypatch.setenv("CORS_ORIGINS", "http://localhost")
 
-    # Force reload (avoids cached 'unit' environment)
-    if hasattr(config.get_settings, "cache_clear"):
-        config.get_settings.cache_clear()
-
     # Act
-    settings = config.get_settings()
+    settings = config.Settings()
 
     # Assert
     assert settings.APP_ENV == "test", f"Expected APP_ENV='test' but got {settings.APP_ENV}"
@@ -137,7 +137,7 @@ def test_global_exception_handler_isolated():
     async def trigger_error():
         raise ValueError("Intentional test error")
 
-    client = TestClient(isolated_app)
+    client = TestClient(isolated_app, raise_server_exceptions=False)
     response = client.get("/test-error")
     payload = response.json()
 
@@ -9,8 +9,15 @@ import pytest
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
+from backend.middleware import rate_limit
 from backend.middleware.rate_limit import RateLimitMiddleware, _request_cache, MAX_REQUESTS_PER_IP
 
+# Client host Starlette's TestClient reports for every request
+TESTCLIENT_IP = "testclient"
+
+# _request_cache is process-global: keep this module on one xdist worker (--dist loadgroup)
+pytestmark = pytest.mark.xdist_group("rate_limit_cache")
+
 # -------------------------------------------------------------------------------------------------
 # Fixtures
 # -------------------------------------------------------------------------------------------------
@@ -53,19 +60,20 @@ def client(app):
 # Tests
 # -------------------------------------------------------------------------------------------------
 def test_rate_limit_allows_within_limit(client):
-    """Should allow requests within the MAX_REQUESTS_PER_IP limit."""
+    """Should allow the request that brings a client exactly to MAX_REQUESTS_PER_IP."""
     _request_cache.clear()
-    for _ in range(MAX_REQUESTS_PER_IP):
-        resp = client.get("/api/test")
-        assert resp.status_code == 200
+    _request_cache[TESTCLIENT_IP] = [time.time()] * (MAX_REQUESTS_PER_IP - 1)
+    resp = client.get("/api/test")
+    assert resp.status_code == 200
     assert len(_request_cache) == 1
+    assert len(_request_cache[TESTCLIENT_IP]) == MAX_REQUESTS_PER_IP
 
 
 def test_rate_limit_exceeds_limit_returns_429(client):
     """Should return 429 when client exceeds MAX_REQUESTS_PER_IP."""
     _request_cache.clear()
-    for _ in range(MAX_REQUESTS_PER_IP + 1):
-        resp = client.get("/api/test")
+    _request_cache[TESTCLIENT_IP] = [time.time()] * MAX_REQUESTS_PER_IP
+    resp = client.get("/api/test")
     assert resp.status_code == 429
     assert "Rate limit exceeded" in resp.json()["detail"]
 
@@ -88,7 +96,7 @@ def test_rate_limit_resets_after_window(monkeypatch, client):
     _request_cache[client_ip] = [now - 120]  # older than 60s window
 
     # monkeypatch time to simulate now
-    monkeypatch.setattr("backend.middleware.rate_limit.time.time", lambda: now)
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now)
     resp = client.get("/api/test")
     assert resp.status_code == 200
     # Old timestamps should be pruned, leaving one
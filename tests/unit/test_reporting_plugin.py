@@ -0,0 +1,20 @@
+# =====================================================================
+# File: tests/unit/test_reporting_plugin.py
+# Description: Unit tests for the latency grouping in tests/plugins/reporting.py
+# =====================================================================
+
+import pytest
+from tests.plugins import reporting
+
+
+@pytest.mark.parametrize("test_name, expected", [
+    ("test_get_tickets_with_filters", "tickets"),
+    ("test_list_users", "users"),
+    ("test_export_and_email_success", "export"),
+    ("test_export_tickets", "tickets"),        # several keywords: priority, not position, decides
+    ("test_export_users_list", "users"),
+    ("test_USER_ticket_export", "tickets"),
+    ("test_health_check", "misc"),
+])
+def test_latency_group_priority(test_name, expected):
+    assert reporting._latency_group(test_name) == expected
@@ -1,6 +1,7 @@
 # =================================================================================================
 # File: tests/unit/test_security_middleware.py
-# Description: Unit tests for TokenAuthMiddleware (environment-safe version)
+# Description: Unit tests for TokenAuthMiddleware, run under both a safe (unit) and a
+#              production-like (prod) environment via the parametrized `app_env` fixture.
 # Author: Olivier Lamy | Version: 1.1.2 | October 2025
 # =================================================================================================
 
@@ -11,21 +12,22 @@ from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 from backend.middleware.security import TokenAuthMiddleware
 
-# -------------------------------------------------------------------------------------------------
-# ⚙️ Global Environment Setup
-# -------------------------------------------------------------------------------------------------
-# Ensure consistent UNIT_MODE environment for test execution
-os.environ.setdefault("ZENDESK_API_TOKEN", "valid-token")
-os.environ.setdefault("APP_ENV", "unit")
-os.environ.setdefault("UNIT_MODE", "1")
-os.environ["INTEGRATION_MODE"] = "0"
-
 # -------------------------------------------------------------------------------------------------
 # Fixtures
 # -------------------------------------------------------------------------------------------------
-@pytest.fixture(scope="module")
+@pytest.fixture(params=["unit", "prod"], autouse=True)
+def app_env(request, monkeypatch):
+    """Run each test under a bypassing (unit) and an enforcing (prod) environment."""
+    monkeypatch.setenv("APP_ENV", request.param)
+    monkeypatch.setenv("UNIT_MODE", "1" if request.param == "unit" else "0")
+    monkeypatch.setenv("ZENDESK_API_TOKEN", "valid-token")
+    monkeypatch.delenv("API_AUTH_TOKEN", raising=False)
+    return request.param
+
+
+@pytest.fixture(scope="session")
 def app():
-    """FastAPI app with TokenAuthMiddleware applied (stable across threads)."""
+    """FastAPI app with TokenAuthMiddleware applied (env is read per request, so one app serves all params)."""
     app = FastAPI()
 
     @app.get("/api/secure")
@@ -40,7 +42,7 @@ def app():
     return app
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def client(app):
     """Reusable test client instance."""
     return TestClient(app)
@@ -95,18 +97,8 @@ def test_bypass_health_and_docs(client):
         assert resp.status_code == 200
 
 
-def test_bypass_in_unit_mode():
-    """Should bypass token validation entirely when UNIT_MODE=1."""
-    os.environ["UNIT_MODE"] = "1"
-    os.environ["APP_ENV"] = "unit"
-
-    app = FastAPI()
-
-    @app.get("/api/secure")
-    async def secure_endpoint():
-        return JSONResponse({"ok": True})
-
-    app.add_middleware(TokenAuthMiddleware)
-    client = TestClient(app)
+@pytest.mark.parametrize("app_env", ["unit"], indirect=True)
+def test_bypass_in_unit_mode(client, app_env):
+    """Should bypass token validation entirely when UNIT_MODE=1 (unit param only; prod would just repeat it)."""
     resp = client.get("/api/secure")
     assert resp.status_code == 200
@@ -11,18 +11,22 @@
 # Version: 2.2.0 | October 2025
 # =================================================================================================
 
-import os
 import pytest
-from fastapi.testclient import TestClient
-from backend.main import app
+from backend.services import zendesk_service
+from backend.routers import tickets as tickets_router
 
-client = TestClient(app)
+# Every tickets-router URL used in this module (built once at import)
+TICKET_URL = "/api/tickets/123"
+COMMENTS_URL = "/api/tickets/123/comments"
+EXPORT_URL = "/api/tickets/export"
+TICKETS_URL = "/api/tickets/tickets"
+MEETING_WINDOW_URL = "/api/tickets/meeting-window"
 
 
 # -------------------------------------------------------------------------------------------------
 # PATCH /api/tickets/{ticket_id}
 # -------------------------------------------------------------------------------------------------
-def test_patch_ticket_zendesk_error(monkeypatch):
+def test_patch_ticket_zendesk_error(monkeypatch, client):
     """
     Router wraps Zendesk update failures as 400 (client/upstream request issue)
     per current implementation.
@@ -30,16 +34,16 @@ def test_patch_ticket_zendesk_error(monkeypatch):
     def mock_update_ticket(*a, **kw):
         raise Exception("API down")
 
-    monkeypatch.setattr("backend.services.zendesk_service.update_ticket", mock_update_ticket)
-    resp = client.patch("/api/tickets/123", json={"status": "open"})
+    monkeypatch.setattr(zendesk_service, "update_ticket", mock_update_ticket)
+    resp = client.patch(TICKET_URL, json={"status": "open"})
     assert resp.status_code == 400
     assert "Zendesk update failed" in resp.json()["detail"]
 
 
-def test_patch_ticket_noop(monkeypatch):
+def test_patch_ticket_noop(monkeypatch, client):
     """No fields -> router returns ok/noop=True without calling Zendesk."""
-    monkeypatch.setattr("backend.services.zendesk_service.update_ticket", lambda *a, **kw: {"id": 123})
-    resp = client.patch("/api/tickets/123", json={})
+    monkeypatch.setattr(zendesk_service, "update_ticket", lambda *a, **kw: {"id": 123})
+    resp = client.patch(TICKET_URL, json={})
     assert resp.status_code == 200
     body = resp.json()
     assert body.get("ok") is True and body.get("noop") is True
@@ -48,19 +52,9 @@ def test_patch_ticket_noop(monkeypatch):
 # -------------------------------------------------------------------------------------------------
 # GET /api/tickets/tickets (normalization)
 # -------------------------------------------------------------------------------------------------
-def test_get_tickets_with_filters(monkeypatch):
+def test_get_tickets_with_filters(export_stubs, client):
     """GET /tickets with filters should return normalized rows."""
-    def mock_search_by_groups_and_statuses(*a, **kw):
-        return [{"id": 1, "status": "open", "subject": "Test", "created_at": "2025-09-01T12:00:00"}]
-
-    monkeypatch.setattr(
-        "backend.services.zendesk_service.search_by_groups_and_statuses",
-        mock_search_by_groups_and_statuses,
-    )
-    monkeypatch.setattr("backend.services.zendesk_service.build_status_map", lambda t: {1: {"status": "open"}})
-    monkeypatch.setattr("backend.services.zendesk_service.enrich_with_resolution_times", lambda sm: None)
-
-    resp = client.get("/api/tickets/tickets?group_ids=1&statuses=open")
+    resp = client.get(TICKETS_URL, params={"group_ids": "1", "statuses": "open"})
     assert resp.status_code == 200
     data = resp.json()
     assert "rows" in data
@@ -70,13 +64,14 @@ def test_get_tickets_with_filters(monkeypatch):
 # -------------------------------------------------------------------------------------------------
 # GET /api/tickets/meeting-window
 # -------------------------------------------------------------------------------------------------
-def test_get_meeting_window(monkeypatch):
+def test_get_meeting_window(monkeypatch, client):
     """Mock compute_meeting_window for deterministic values."""
     monkeypatch.setattr(
-        "backend.routers.tickets.compute_meeting_window",
+        tickets_router,
+        "compute_meeting_window",
         lambda: {"start": "2025-09-01", "end": "2025-09-15"},
     )
-    resp = client.get("/api/tickets/meeting-window")
+    resp = client.get(MEETING_WINDOW_URL)
     assert resp.status_code == 200
     data = resp.json()
     assert data["start"] == "2025-09-01"
@@ -86,15 +81,15 @@ def test_get_meeting_window(monkeypatch):
 # -------------------------------------------------------------------------------------------------
 # POST /api/tickets/{ticket_id}/comments
 # -------------------------------------------------------------------------------------------------
-def test_post_comment_success(monkeypatch):
+def test_post_comment_success(monkeypatch, client):
     """POST comment should succeed with valid payload."""
     def mock_add_comment(ticket_id, text, public=False):
         return {"id": ticket_id, "comment": text, "public": public}
 
     # ✅ patch the correct service function
-    monkeypatch.setattr("backend.services.zendesk_service.add_comment", mock_add_comment)
+    monkeypatch.setattr(zendesk_service, "add_comment", mock_add_comment)
 
-    resp = client.post("/api/tickets/321/comments", json={"body": "Test comment", "is_public": True})
+    resp = client.post(COMMENTS_URL, json={"body": "Test comment", "is_public": True})
     assert resp.status_code == 200
     body = resp.json()
     assert body["ok"] is True
@@ -102,7 +97,7 @@ def test_post_comment_success(monkeypatch):
     assert body["ticket"]["public"] is True
 
 
-def test_post_comment_empty(monkeypatch):
+def test_post_comment_empty(monkeypatch, client):
     """
     Send is_public to pass Pydantic validation (avoid 422).
     Router rejects empty body with 400.
@@ -111,20 +106,20 @@ def test_post_comment_empty(monkeypatch):
         # Won't be reached because router raises 400 before calling service
         return {"id": ticket_id, "comment": text, "public": public}
 
-    monkeypatch.setattr("backend.services.zendesk_service.add_comment", mock_add_comment)
-    resp = client.post("/api/tickets/123/comments", json={"body": "", "is_public": False})
+    monkeypatch.setattr(zendesk_service, "add_comment", mock_add_comment)
+    resp = client.post(COMMENTS_URL, json={"body": "", "is_public": False})
     assert resp.status_code == 400
     assert "Empty comment" in resp.text
 
 
-def test_post_comment_zendesk_failure(monkeypatch):
-    os.environ["UNIT_MODE"] = "0"  # ✅ ensure we don't skip zendesk logic
+def test_post_comment_zendesk_failure(monkeypatch, client):
+    monkeypatch.setenv("UNIT_MODE", "0")  # ✅ ensure we don't skip zendesk logic
 
     def mock_add_comment(*a, **kw):
         raise Exception("Zendesk unavailable")
 
-    monkeypatch.setattr("backend.services.zendesk_service.add_comment", mock_add_comment)
-    resp = client.post("/api/tickets/123/comments", json={"body": "Hello", "is_public": False})
+    monkeypatch.setattr(zendesk_service, "add_comment", mock_add_comment)
+    resp = client.post(COMMENTS_URL, json={"body": "Hello", "is_public": False})
     assert resp.status_code == 400
     assert "Zendesk comment failed" in resp.text
 
@@ -132,89 +127,45 @@ def test_post_comment_zendesk_failure(monkeypatch):
 # -------------------------------------------------------------------------------------------------
 # POST /api/tickets/export — Export + Email flow (SharePoint + Email mocked)
 # -------------------------------------------------------------------------------------------------
-def test_export_and_email_success(monkeypatch):
-    """Happy path for export — mock dataset, workbook, SP upload, and email."""
-    # dataset
-    monkeypatch.setattr(
-        "backend.services.zendesk_service.search_by_groups_and_statuses",
-        lambda *a, **k: [{"id": 1, "status": "open", "subject": "Test", "created_at": "2025-09-01T00:00:00"}],
-    )
-    # build status map + enrich
-    monkeypatch.setattr("backend.services.zendesk_service.build_status_map", lambda t: {1: {"status": "open"}})
-    monkeypatch.setattr("backend.services.zendesk_service.enrich_with_resolution_times", lambda sm: None)
-    # workbook
-    monkeypatch.setattr(
-        "backend.utils.helpers.make_ticket_workbook",
-        lambda rows: (b"bytes", "unit-export.xlsx"),
-    )
-    # SharePoint upload + email
-    monkeypatch.setattr(
-        "backend.services.sharepoint_service.upload_bytes",
-        lambda name, data: "https://sharepoint.example.com/unit-export.xlsx",
-    )
-    monkeypatch.setattr(
-        "backend.services.email_service.send_directors_export_link",
-        lambda url, name: True,
-    )
-
-    resp = client.post("/api/tickets/export")
+def test_export_and_email_success(export_stubs, client):
+    """Happy path for export — dataset, workbook, SP upload, and email all stubbed."""
+    resp = client.post(EXPORT_URL)
     assert resp.status_code == 200
     body = resp.json()
     assert body["ok"] is True
     assert body["sharepointUrl"].startswith("https://sharepoint.example.com/")
 
 
-def test_export_and_email_sharepoint_fail(monkeypatch):
+def test_export_and_email_sharepoint_fail(export_stubs, client):
     """SharePoint failure mapped to 502 per route code."""
-    # dataset + workbook as above
-    monkeypatch.setattr(
-        "backend.services.zendesk_service.search_by_groups_and_statuses",
-        lambda *a, **k: [{"id": 1, "status": "open", "subject": "Test"}],
-    )
-    monkeypatch.setattr("backend.services.zendesk_service.build_status_map", lambda t: {1: {"status": "open"}})
-    monkeypatch.setattr("backend.services.zendesk_service.enrich_with_resolution_times", lambda sm: None)
-    monkeypatch.setattr(
-        "backend.utils.helpers.make_ticket_workbook",
-        lambda rows: (b"bytes", "unit-export.xlsx"),
-    )
-
     def mock_upload_bytes(name, data):
         raise Exception("SharePoint service error")
 
-    monkeypatch.setattr("backend.services.sharepoint_service.upload_bytes", mock_upload_bytes)
-    monkeypatch.setattr(
-        "backend.services.email_service.send_directors_export_link",
-        lambda url, name: True,
-    )
+    export_stubs.upload_bytes = mock_upload_bytes
 
-    resp = client.post("/api/tickets/export")
+    resp = client.post(EXPORT_URL)
     assert resp.status_code == 502
     assert "SharePoint upload failed" in resp.text
 
 
-def test_export_and_email_email_fail(monkeypatch):
+def test_export_and_email_email_fail(export_stubs, client):
     """Email failure mapped to 502 per route code."""
-    # dataset + workbook + SP upload OK
-    monkeypatch.setattr(
-        "backend.services.zendesk_service.search_by_groups_and_statuses",
-        lambda *a, **k: [{"id": 1, "status": "open", "subject": "Test"}],
-    )
-    monkeypatch.setattr("backend.services.zendesk_service.build_status_map", lambda t: {1: {"status": "open"}})
-    monkeypatch.setattr("backend.services.zendesk_service.enrich_with_resolution_times", lambda sm: None)
-    monkeypatch.setattr(
-        "backend.utils.helpers.make_ticket_workbook",
-        lambda rows: (b"bytes", "unit-export.xlsx"),
-    )
-    monkeypatch.setattr(
-        "backend.services.sharepoint_service.upload_bytes",
-        lambda name, data: "https://sharepoint.example.com/unit-export.xlsx",
-    )
-
     def mock_email(url, name):
         raise Exception("Email service error")
 
-    monkeypatch.setattr("backend.services.email_service.send_directors_export_link", mock_email)
+    export_stubs.send_directors_export_link = mock_email
 
-    resp = client.post("/api/tickets/export")
+    resp = client.post(EXPORT_URL)
     assert resp.status_code == 502
-    assert "Email send failed" in resp.text
\ No newline at end of file
+    assert "Email send failed" in resp.text
+
+
+def test_export_and_email_dataset_fail_surfaces_original_error(export_stubs, client):
+    """A dataset error in the worker-thread pull propagates as-is; the export stops before the workbook step."""
+    def mock_search(*a, **k):
+        raise RuntimeError("Zendesk search down")
+
+    export_stubs.search_by_groups_and_statuses = mock_search
+
+    with pytest.raises(RuntimeError, match="Zendesk search down"):
+        client.post(EXPORT_URL)
@@ -2,41 +2,42 @@
 # File: tests/unit/test_users.py
 # =====================================================================
 
+from types import SimpleNamespace
+
 import pytest
-from fastapi.testclient import TestClient
-from backend.main import app
+from backend.routers import users as users_router
 from backend.utils.logger import get_logger
 
 logger = get_logger("users")
 
-client = TestClient(app)
+USERS_URL = "/api/users"
 
 
-def test_list_users_success(monkeypatch):
+def test_list_users_success(monkeypatch, client):
     def mock_list_users():
         return [{"id": 1, "name": "Test User"}]
 
     # Patch the zd object inside users.py
-    monkeypatch.setattr("backend.routers.users.zd", type("ZD", (), {"list_oaps_users": mock_list_users}))
+    monkeypatch.setattr(users_router, "zd", SimpleNamespace(list_oaps_users=mock_list_users))
 
-    resp = client.get("/api/users")
+    resp = client.get(USERS_URL)
     assert resp.status_code == 200
     assert resp.json() == {"users": [{"id": 1, "name": "Test User"}]}
 
 
-def test_list_users_failure(monkeypatch):
+def test_list_users_failure(monkeypatch, client):
     def mock_list_users():
         raise Exception("Boom")
 
-    monkeypatch.setattr("backend.routers.users.zd", type("ZD", (), {"list_oaps_users": mock_list_users}))
+    monkeypatch.setattr(users_router, "zd", SimpleNamespace(list_oaps_users=mock_list_users))
 
-    resp = client.get("/api/users")
+    resp = client.get(USERS_URL)
     assert resp.status_code == 502
     assert "User fetch failed" in resp.json()["detail"]
 
 
-def test_list_users_empty(monkeypatch):
-    monkeypatch.setattr("backend.routers.users.zd", type("ZD", (), {"list_oaps_users": lambda: []}))
-    resp = client.get("/api/users")
+def test_list_users_empty(monkeypatch, client):
+    monkeypatch.setattr(users_router, "zd", SimpleNamespace(list_oaps_users=lambda: []))
+    resp = client.get(USERS_URL)
     assert resp.status_code == 200
     assert resp.json() == {"users": []}
@@ -1,20 +1,17 @@
-from fastapi import FastAPI
-from fastapi.testclient import TestClient
-
-from backend.utils.error_handler import generic_exception_handler
+import json
 
+import pytest
+from starlette.requests import Request
 
-def test_v2_3_error_handler_returns_json():
-    app = FastAPI()
-    app.add_exception_handler(Exception, generic_exception_handler)
+from backend.utils.error_handler import generic_exception_handler
 
-    @app.get("/boom")
-    def boom():
-        raise RuntimeError("explode")
 
-    client = TestClient(app, raise_server_exceptions=False)
-    r = client.get("/boom")
-    assert r.status_code == 500
-    j = r.json()
+@pytest.mark.anyio
+async def test_v2_3_error_handler_returns_json():
+    # Call the handler directly; no app, client, or HTTP framing needed
+    req = Request({"type": "http", "method": "GET", "path": "/boom", "headers": []})
+    resp = await generic_exception_handler(req, RuntimeError("explode"))
+    assert resp.status_code == 500
+    j = json.loads(resp.body)
     assert j["error"] == "explode"
     assert j["path"] == "/boom"
@@ -1,24 +1,24 @@
 # Phase 3: Export metadata endpoint tests
 
-import json
-from pathlib import Path
-from fastapi.testclient import TestClient
-from backend.main import app
+import os
 
+import orjson
 
-def test_v2_3_get_last_export_metadata_when_absent(monkeypatch, tmp_path):
+EXPORT_LAST_URL = "/api/v2/tickets/export/last"
+
+
+def test_v2_3_get_last_export_metadata_when_absent(monkeypatch, tmp_path, client):
     meta_path = tmp_path / "export_meta.json"
     monkeypatch.setenv("EXPORT_META_PATH", str(meta_path))
 
-    client = TestClient(app)
-    r = client.get("/api/v2/tickets/export/last")
+    r = client.get(EXPORT_LAST_URL)
     assert r.status_code == 200
     payload = r.json()
     assert payload.get("ok") is False
     assert "No export metadata" in payload.get("detail", "")
 
 
-def test_v2_3_get_last_export_metadata_when_present(monkeypatch, tmp_path):
+def test_v2_3_get_last_export_metadata_when_present(monkeypatch, tmp_path, client):
     meta_path = tmp_path / "export_meta.json"
     monkeypatch.setenv("EXPORT_META_PATH", str(meta_path))
     meta = {
@@ -29,11 +29,24 @@ def test_v2_3_get_last_export_metadata_when_present(monkeypatch, tmp_path):
         "filters": {"group_ids": ["1"], "statuses": ["open"], "ids_csv": None},
     }
     meta_path.parent.mkdir(parents=True, exist_ok=True)
-    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    meta_path.write_bytes(orjson.dumps(meta))
 
-    client = TestClient(app)
-    r = client.get("/api/v2/tickets/export/last")
+    r = client.get(EXPORT_LAST_URL)
     assert r.status_code == 200
     payload = r.json()
     assert payload.get("ok") is True
     assert payload.get("meta", {}).get("filename") == "export.xlsx"
+
+
+def test_v2_3_get_last_export_metadata_reloads_after_rewrite(monkeypatch, tmp_path, client):
+    meta_path = tmp_path / "export_meta.json"
+    monkeypatch.setenv("EXPORT_META_PATH", str(meta_path))
+
+    meta_path.write_bytes(orjson.dumps({"filename": "first.xlsx"}))
+    assert client.get(EXPORT_LAST_URL).json()["meta"]["filename"] == "first.xlsx"
+
+    # Same size on purpose; bump mtime explicitly so coarse-timestamp filesystems still invalidate
+    meta_path.write_bytes(orjson.dumps({"filename": "later.xlsx"}))
+    st = meta_path.stat()
+    os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert client.get(EXPORT_LAST_URL).json()["meta"]["filename"] == "later.xlsx"
@@ -1,23 +1,22 @@
-from fastapi.testclient import TestClient
-from backend.main import app
+import asyncio
 
+import pytest
 
-def test_v2_3_health_root():
-    client = TestClient(app)
+
+def test_v2_3_health_root(client):
     r = client.get("/")
     assert r.status_code == 200
     assert r.json().get("status") == "ok"
 
 
-def test_v2_3_health_endpoints(monkeypatch):
-    client = TestClient(app)
-    # /health is public
-    r = client.get("/health")
+@pytest.mark.anyio
+async def test_v2_3_health_endpoints(async_client, auth_headers):
+    # /health is public; versioned health requires auth
+    r, r2 = await asyncio.gather(
+        async_client.get("/health"),
+        async_client.get("/api/v2/health", headers=auth_headers),
+    )
     assert r.status_code == 200
     assert r.json().get("status") == "ok"
-
-    # versioned health requires auth
-    monkeypatch.setenv("API_AUTH_TOKEN", "test-token")
-    r2 = client.get("/api/v2/health", headers={"Authorization": "Bearer test-token"})
     assert r2.status_code == 200
     assert r2.json().get("status") == "ok"
@@ -1,3 +1,4 @@
+import pytest
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
@@ -21,49 +22,42 @@ def make_app():
     return app
 
 
-def test_v2_3_sec_missing_header(monkeypatch):
-    monkeypatch.setenv("APP_ENV", "integration")
-    monkeypatch.delenv("API_AUTH_TOKEN", raising=False)
-    client = TestClient(make_app())
-    r = client.get("/api/protected")
-    assert r.status_code == 401
-
-
-def test_v2_3_sec_invalid_format(monkeypatch):
-    monkeypatch.setenv("APP_ENV", "integration")
-    monkeypatch.setenv("API_AUTH_TOKEN", "abc")
-    client = TestClient(make_app())
-    r = client.get("/api/protected", headers={"Authorization": "Token abc"})
-    assert r.status_code == 401
+@pytest.fixture(scope="module")
+def client():
+    # TokenAuthMiddleware reads env per request, so one app serves every case below
+    return TestClient(make_app())
 
 
-def test_v2_3_sec_invalid_token(monkeypatch):
+@pytest.mark.parametrize(
+    "env_token,hdr,expected",
+    [
+        (None, None, 401),                      # missing header
+        ("abc", "Token abc", 401),              # invalid format
+        ("expected", "Bearer wrong", 403),      # invalid token
+        ("expected", "Bearer expected", 200),   # valid token
+    ],
+    ids=["missing_header", "invalid_format", "invalid_token", "valid_token"],
+)
+def test_v2_3_sec(env_token, hdr, expected, monkeypatch, client):
     monkeypatch.setenv("APP_ENV", "integration")
-    monkeypatch.setenv("API_AUTH_TOKEN", "expected")
-    client = TestClient(make_app())
-    r = client.get("/api/protected", headers={"Authorization": "Bearer wrong"})
-    assert r.status_code == 403
-
-
-def test_v2_3_sec_valid_token(monkeypatch):
-    monkeypatch.setenv("APP_ENV", "integration")
-    monkeypatch.setenv("API_AUTH_TOKEN", "expected")
-    client = TestClient(make_app())
-    r = client.get("/api/protected", headers={"Authorization": "Bearer expected"})
-    assert r.status_code == 200
-    assert r.json()["ok"] is True
+    if env_token is None:
+        monkeypatch.delenv("API_AUTH_TOKEN", raising=False)
+    else:
+        monkeypatch.setenv("API_AUTH_TOKEN", env_token)
+    r = client.get("/api/protected", headers={"Authorization": hdr} if hdr else None)
+    assert r.status_code == expected
+    if expected == 200:
+        assert r.json()["ok"] is True
 
 
-def test_v2_3_sec_bypass_root(monkeypatch):
+def test_v2_3_sec_bypass_root(monkeypatch, client):
     monkeypatch.setenv("APP_ENV", "integration")
-    client = TestClient(make_app())
     r = client.get("/")
     assert r.status_code == 200
 
 
-def test_v2_3_sec_safe_env_bypass(monkeypatch):
+def test_v2_3_sec_safe_env_bypass(monkeypatch, client):
     monkeypatch.setenv("APP_ENV", "local")
-    client = TestClient(make_app())
     # No Authorization header required in SAFE_ENVS
     r = client.get("/api/protected")
     assert r.status_code == 200
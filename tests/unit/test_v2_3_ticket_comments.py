@@ -1,10 +1,9 @@
 # Phase 3: Last N comments endpoint tests
 
-from fastapi.testclient import TestClient
-from backend.main import app
+import backend.services.zendesk_service as zs
 
 
-def test_v2_3_last_comments_happy_path(monkeypatch):
+def test_v2_3_last_comments_happy_path(monkeypatch, client):
     # Stub service layer
     def _fake_get_last_comments(ticket_id: int, limit: int = 3):
         return [
@@ -13,10 +12,8 @@ def test_v2_3_last_comments_happy_path(monkeypatch):
             {"id": 1, "author_id": 1001, "public": True, "created_at": "2025-10-21T12:01:00Z", "body": "c1"},
         ][:limit]
 
-    import backend.services.zendesk_service as zs
     monkeypatch.setattr(zs, "get_last_comments", _fake_get_last_comments)
 
-    client = TestClient(app)
     r = client.get("/api/v2/tickets/123/comments?limit=3")
     assert r.status_code == 200
     payload = r.json()
@@ -26,14 +23,12 @@ def test_v2_3_last_comments_happy_path(monkeypatch):
     assert comments[0]["id"] == 3
 
 
-def test_v2_3_last_comments_error(monkeypatch):
+def test_v2_3_last_comments_error(monkeypatch, client):
     def _boom(ticket_id: int, limit: int = 3):
         raise RuntimeError("downstream")
 
-    import backend.services.zendesk_service as zs
     monkeypatch.setattr(zs, "get_last_comments", _boom)
 
-    client = TestClient(app)
     r = client.get("/api/v2/tickets/123/comments?limit=2")
     assert r.status_code == 502
     payload = r.json()
@@ -1,20 +1,15 @@
-from fastapi.testclient import TestClient
-from backend.main import app
+import backend.services.zendesk_service as zs
+import backend.utils.helpers as helpers
 
 
-def test_v2_3_meeting_window_endpoint(monkeypatch):
-    monkeypatch.setenv("API_AUTH_TOKEN", "test-token")
-    client = TestClient(app)
-    r = client.get("/api/v2/tickets/meeting-window", headers={"Authorization": "Bearer test-token"})
+def test_v2_3_meeting_window_endpoint(client, auth_headers):
+    r = client.get("/api/v2/tickets/meeting-window", headers=auth_headers)
     assert r.status_code == 200
     assert isinstance(r.json(), dict)
 
 
-def test_v2_3_get_tickets_ids_csv(monkeypatch):
+def test_v2_3_get_tickets_ids_csv(monkeypatch, client, auth_headers):
     # Stub downstream service/helpers to avoid external calls
-    import backend.services.zendesk_service as zs
-    import backend.utils.helpers as helpers
-
     def _show_many(ids):
         return [{"id": int(i), "status": "open", "updated_at": "t"} for i in ids]
 
@@ -36,11 +31,9 @@ def test_v2_3_get_tickets_ids_csv(monkeypatch):
     monkeypatch.setattr(helpers, "compute_meeting_window", _compute_meeting_window)
     monkeypatch.setattr(helpers, "build_ticket_rows", _build_rows)
 
-    monkeypatch.setenv("API_AUTH_TOKEN", "test-token")
-    client = TestClient(app)
     r = client.get(
         "/api/v2/tickets?ids_csv=1,2",
-        headers={"Authorization": "Bearer test-token"},
+        headers=auth_headers,
     )
     j = r.json()
     assert r.status_code == 200
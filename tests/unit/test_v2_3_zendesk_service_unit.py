@@ -16,14 +16,14 @@ def test_v2_3_build_status_map_coercion():
 
 def test_v2_3_enrich_with_resolution_times(monkeypatch):
     # stub both potential upstreams
-    def _metrics(_tid: int):
+    def _metrics(tids):
         # return None for first, value for second
-        return "2025-01-01T00:00:00Z" if _tid == 2 else None
+        return {tid: ("2025-01-01T00:00:00Z" if tid == 2 else None) for tid in tids}
 
     def _audits(_tid: int):
         return "2025-02-02T00:00:00Z"
 
-    monkeypatch.setattr(zs, "get_metrics_solved_at", _metrics)
+    monkeypatch.setattr(zs, "get_metrics_many", _metrics)
     monkeypatch.setattr(zs, "get_last_resolution_from_audits", _audits)
 
     m = {1: {"status": "closed"}, 2: {"status": "solved"}, 3: {"status": "open"}}
@@ -4,9 +4,10 @@
 # Author: Olivier Lamy (Refactored)
 # =====================================================================
 
+import json
 import pytest
-import requests # Need to import requests to correctly patch it later
-from unittest.mock import MagicMock
+import requests
+from unittest.mock import Mock
 
 # Import the module under test
 from backend.services import zendesk_service as zd
@@ -23,6 +24,11 @@ class MockResponse:
         self.status_code = status_code
         self.headers = headers if headers is not None else {}
 
+    @property
+    def content(self):
+        """Raw body bytes, as _retry's orjson-backed .json() reads them."""
+        return json.dumps(self._json).encode()
+
     def json(self):
         """Returns the JSON payload."""
         return self._json
@@ -30,39 +36,203 @@ class MockResponse:
     def raise_for_status(self):
         """Simulates the requests.raise_for_status behavior."""
         if not (200 <= self.status_code < 300):
-            # Use requests.HTTPError for robustness in unit testing
             raise requests.HTTPError(f"HTTP {self.status_code} error")
 
 
+# ---------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------
+
+MOCK_CONFIG = {
+    'base_url': 'https://mock.zendesk.com/api/v2',
+    'email': 'u@e.com',
+    'token': 't'
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def zd_config():
+    """Every test in this module sees the same stub config; installed once per module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(zd, "_get_config", lambda: MOCK_CONFIG)
+        yield MOCK_CONFIG
+
+
+@pytest.fixture(scope="session")
+def make_response():
+    """Shared MockResponse factory: make_response(data, status_code=200, headers=None)."""
+    return MockResponse
+
+
+@pytest.fixture
+def patched_retry(monkeypatch):
+    """_retry replaced once per test; set .return_value / .side_effect as needed."""
+    retry = Mock()
+    monkeypatch.setattr(zd, "_retry", retry)
+    return retry
+
+
 # ---------------------------------------------------------------------
 # Test Helper Functions (_safe_email, _safe_token, build_status_map)
 # ---------------------------------------------------------------------
 
-def test_safe_email():
+@pytest.mark.parametrize("email, expected", [
+    ("user@example.com", "u***@example.com"),
+    ("a@b.c", "a***@b.c"),
+    (None, "hidden"),
+    ("no-at-sign", "hidden"),
+])
+def test_safe_email(email, expected):
     """Test email masking utility."""
-    assert zd._safe_email("user@example.com").startswith("u***@")
-    assert zd._safe_email(None) == "hidden"
-    assert zd._safe_email("a@b.c") == "a***@b.c"
+    assert zd._safe_email(email) == expected
 
 
-def test_safe_token():
+@pytest.mark.parametrize("token, expected", [
+    ("abcdef123456", "abc...456"),
+    ("123", "hidden"),
+    (None, "hidden"),
+])
+def test_safe_token(token, expected):
     """Test token masking utility."""
-    assert zd._safe_token("abcdef123456") == "abc...456"
-    assert zd._safe_token("123") == "hidden"
-
-
-def test_build_status_map():
+    assert zd._safe_token(token) == expected
+
+
+@pytest.mark.parametrize("tickets, expected_keys", [
+    (
+        [
+            {"id": 1, "status": "open", "updated_at": "2025-09-29"},
+            {"id": "2", "status": "solved", "updated_at": "2025-09-28"},
+            {"id": "abc", "status": "ignored", "updated_at": "2025-09-27"},  # Non-digit IDs are ignored
+        ],
+        {1, 2},
+    ),
+    ([], set()),
+])
+def test_build_status_map(tickets, expected_keys):
     """Test creation of the status mapping dictionary."""
-    tickets = [
-        {"id": 1, "status": "open", "updated_at": "2025-09-29"},
-        {"id": "2", "status": "solved", "updated_at": "2025-09-28"},
-        {"id": "abc", "status": "ignored", "updated_at": "2025-09-27"},
-    ]
     result = zd.build_status_map(tickets)
     assert isinstance(result, dict)
-    assert 1 in result and 2 in result
-    assert "abc" not in result # Non-digit IDs should be ignored
-    assert result[1]["status"] == "open"
+    assert set(result) == expected_keys
+    for t in tickets:
+        if str(t["id"]).isdigit():
+            assert result[int(t["id"])]["status"] == t["status"]
+
+
+def test_build_status_map_interns_statuses():
+    """Test that statuses are interned, so equal statuses share one string object."""
+    a, b = "".join(["sol", "ved"]), "".join(["so", "lved"])
+    result = zd.build_status_map([{"id": 1, "status": a}, {"id": 2, "status": b}])
+    assert result[1]["status"] is result[2]["status"]
+
+
+def test_token_bucket_paces_after_burst(monkeypatch):
+    """Test that the limiter allows a full burst, then sleeps for the refill gap."""
+    sleep = Mock()
+    monkeypatch.setattr(zd.time, "sleep", sleep)
+    bucket = zd._TokenBucket(2, 60)
+
+    bucket.acquire()
+    bucket.acquire()
+    sleep.assert_not_called()
+
+    bucket.acquire()
+    sleep.assert_called_once()
+    assert sleep.call_args.args[0] == pytest.approx(30, abs=0.5)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (None, zd.DEFAULT_MAX_REQUESTS_PER_MIN),
+    ("120", 120),
+    ("abc", zd.DEFAULT_MAX_REQUESTS_PER_MIN),
+    ("0", zd.DEFAULT_MAX_REQUESTS_PER_MIN),
+    ("-5", zd.DEFAULT_MAX_REQUESTS_PER_MIN),
+])
+def test_parse_rate_validates_env_value(raw, expected):
+    """Test that the limiter rate falls back to the default on unset or invalid values."""
+    assert zd._parse_rate(raw) == expected
+
+
+def test_limiter_rate_comes_from_config(monkeypatch, make_response):
+    """Test that _retry paces through the bucket for the configured rate."""
+    monkeypatch.setattr(zd, "_get_config", lambda: {**MOCK_CONFIG, "max_requests_per_min": 42})
+    monkeypatch.setattr(zd._session, "request", Mock(return_value=make_response({})))
+    zd._retry("GET", "https://mock.zendesk.com/api/v2/x.json")
+    assert zd._limiter_for(42).capacity == 42
+    assert zd._limiter_for(42).tokens < 42
+
+
+def test_retry_sends_through_session_and_retries_429(monkeypatch, make_response):
+    """Test that _retry issues requests on the shared session and retries once after a 429."""
+    monkeypatch.setattr(zd.time, "sleep", Mock())
+    request = Mock(side_effect=[
+        make_response({}, status_code=429, headers={"Retry-After": "0"}),
+        make_response({"ok": True}),
+    ])
+    monkeypatch.setattr(zd._session, "request", request)
+
+    r = zd._retry("GET", "https://mock.zendesk.com/api/v2/x.json", timeout=30)
+
+    assert r.json() == {"ok": True}
+    assert request.call_count == 2
+    request.assert_called_with("GET", "https://mock.zendesk.com/api/v2/x.json", timeout=30)
+
+
+def test_retry_skips_raise_for_status_on_2xx(monkeypatch, make_response):
+    """Test that successful responses are returned without calling raise_for_status."""
+    ok = make_response({"ok": True})
+    ok.raise_for_status = Mock()
+    monkeypatch.setattr(zd._session, "request", Mock(return_value=ok))
+
+    r = zd._retry("GET", "https://mock.zendesk.com/api/v2/x.json")
+    assert r.status_code == 200 and r.json() == {"ok": True}
+    ok.raise_for_status.assert_not_called()
+
+
+@pytest.mark.parametrize("method, status, expected_calls", [
+    ("GET", 503, 2),   # transient 5xx on a GET is retried
+    ("PUT", 502, 1),   # a PUT is never replayed after a 5xx
+    ("GET", 404, 1),   # not in the retry table
+])
+def test_retry_status_table(monkeypatch, make_response, method, status, expected_calls):
+    """Test that _retry consults the status table and raises once retries are exhausted."""
+    monkeypatch.setattr(zd.time, "sleep", Mock())
+    request = Mock(return_value=make_response({}, status_code=status))
+    monkeypatch.setattr(zd._session, "request", request)
+
+    with pytest.raises(requests.HTTPError):
+        zd._retry(method, "https://mock.zendesk.com/api/v2/x.json", timeout=30)
+    assert request.call_count == expected_calls
+
+
+def test_reload_config_rereads_environment(monkeypatch):
+    """Test that config is cached until reload_config picks up rotated env values."""
+    with monkeypatch.context() as mp:
+        mp.setenv("ZENDESK_SUBDOMAIN", "first")
+        assert zd.reload_config()["subdomain"] == "first"
+        mp.setenv("ZENDESK_SUBDOMAIN", "second")
+        assert zd._load_config()["subdomain"] == "first"  # still cached
+        assert zd.reload_config()["subdomain"] == "second"
+    zd.reload_config()  # leave the cache matching the restored environment
+
+
+def test_session_auth_follows_current_config(monkeypatch):
+    """Test that session auth is resolved from _get_config per request, not frozen at load."""
+    def _auth_header():
+        prepared = requests.Request("GET", "https://mock.zendesk.com/api/v2/x.json").prepare()
+        return zd._session.auth(prepared).headers["Authorization"]
+
+    assert _auth_header() == requests.auth._basic_auth_str("u@e.com/token", "t")
+    monkeypatch.setattr(zd, "_get_config", lambda: {**MOCK_CONFIG, "token": "rotated"})
+    assert _auth_header() == requests.auth._basic_auth_str("u@e.com/token", "rotated")
+
+
+def test_legacy_constants_resolve_lazily(monkeypatch):
+    """Test that legacy module constants read the current config on access."""
+    monkeypatch.setattr(zd, "_get_config", lambda: {**MOCK_CONFIG, "oaps_group_ids": ["9"]})
+    assert zd.ZENDESK_API_URL == MOCK_CONFIG["base_url"]
+    assert zd.OAPS_GROUP_IDS == ["9"]
+    with pytest.raises(AttributeError):
+        zd.NOT_A_SETTING
 
 
 # ---------------------------------------------------------------------
@@ -71,19 +241,11 @@ def test_build_status_map():
 
 # Note: The easiest way to mock Zendesk calls when _retry is used is to mock _retry itself.
 
-def test_update_ticket_success(mocker):
+def test_update_ticket_success(patched_retry, make_response):
     """Test successful ticket update."""
     
     # Mock the _retry helper function to return a successful response
-    mock_response = MockResponse({"ticket": {"id": 123, "status": "open", "assignee_id": 456}})
-    mock_retry = mocker.patch("backend.services.zendesk_service._retry", return_value=mock_response)
-    
-    # Mock _get_config, as it is called by _retry's call to _auth (via _auth)
-    mocker.patch("backend.services.zendesk_service._get_config", return_value={
-        'base_url': 'https://mock.zendesk.com/api/v2',
-        'email': 'u@e.com',
-        'token': 't'
-    })
+    patched_retry.return_value = make_response({"ticket": {"id": 123, "status": "open", "assignee_id": 456}})
 
     result = zd.update_ticket(123, status="open", assignee_id=456)
     
@@ -94,45 +256,27 @@ def test_update_ticket_success(mocker):
     
     # Assertions on the mock call (ensure it was called with PUT)
     # The actual call signature is inside zd._retry, so we only check _retry was called
-    mock_retry.assert_called_once()
+    patched_retry.assert_called_once()
+    assert patched_retry.call_args.args[0] == "PUT"
 
 
-def test_update_ticket_failure_raises(mocker):
+def test_update_ticket_failure_raises(patched_retry):
     """Test that failed API call raises an exception."""
-
-    # Mock _retry to return a 500 error
-    mock_response = MockResponse({"error": "failed"}, status_code=500)
-    # This time, we mock the function being passed to _retry: requests.put
-    mocker.patch("requests.put", return_value=mock_response)
-    
-    # We must patch _retry itself, as it calls raise_for_status
-    # We mock _retry to execute the real requests.put call (which we just patched)
-    # OR, we mock _retry to return the failing response and let it handle the error.
-    
-    # Cleanest way: Mock _retry to return the failing response
-    failing_response = MockResponse({"error": "failed"}, status_code=500)
-    mocker.patch("backend.services.zendesk_service._retry", side_effect=requests.HTTPError("HTTP 500"))
+    # _retry calls raise_for_status, so a 500 surfaces from it as HTTPError
+    patched_retry.side_effect = requests.HTTPError("HTTP 500")
 
     with pytest.raises(requests.HTTPError):
         # zd.update_ticket will call _retry, which will raise HTTPError immediately
         zd.update_ticket(1, status="open")
 
 
-def test_add_comment_success(mocker):
+def test_add_comment_success(patched_retry, make_response):
     """Test successful addition of a comment."""
     
     # Mock _retry to return a successful response containing the ticket/comment data
     mock_data = {"ticket": {"id": 1, "comment": {"body": "hi", "public": True}}}
-    mock_response = MockResponse(mock_data, 200)
-    mocker.patch("backend.services.zendesk_service._retry", return_value=mock_response)
+    patched_retry.return_value = make_response(mock_data, 200)
     
-    # Mock config helper as it's needed by the service function's internal calls
-    mocker.patch("backend.services.zendesk_service._get_config", return_value={
-        'base_url': 'https://mock.zendesk.com/api/v2',
-        'email': 'u@e.com',
-        'token': 't'
-    })
-
     result = zd.add_comment(1, "hi", public=True)
     
     assert result["id"] == 1
@@ -147,14 +291,14 @@ def test_add_comment_success(mocker):
 # Test Metrics and Audits (enrich_with_resolution_times)
 # ---------------------------------------------------------------------
 
-def test_enrich_with_resolution_times_modifies_map(mocker):
+def test_enrich_with_resolution_times_modifies_map(monkeypatch):
     """Test that a solved ticket is enriched with a resolved_at timestamp."""
     
     # Mock the two internal functions used for resolution time
-    mock_metrics = mocker.patch("backend.services.zendesk_service.get_metrics_solved_at", 
-                                return_value="2025-09-01T10:00:00Z")
-    mock_audits = mocker.patch("backend.services.zendesk_service.get_last_resolution_from_audits", 
-                               return_value=None) # Should not be called
+    mock_metrics = Mock(return_value={1: "2025-09-01T10:00:00Z"})
+    mock_audits = Mock(return_value=None) # Should not be called
+    monkeypatch.setattr(zd, "get_metrics_many", mock_metrics)
+    monkeypatch.setattr(zd, "get_last_resolution_from_audits", mock_audits)
     
     smap = {
         1: {"status": "solved", "updated_at": "2025-09-01T11:00:00Z"},
@@ -165,20 +309,19 @@ def test_enrich_with_resolution_times_modifies_map(mocker):
     
     assert smap[1].get("resolved_at") == "2025-09-01T10:00:00Z"
     assert "resolved_at" not in smap[2]
-    mock_metrics.assert_called_once_with(1)
+    mock_metrics.assert_called_once_with([1])  # only resolved tickets are batched
     mock_audits.assert_not_called()
 
 
-def test_enrich_audits_fallback(mocker):
+def test_enrich_audits_fallback(monkeypatch):
     """Test that audit fallback is used if metrics fail."""
     
     # Metrics fails (raises exception) or returns None
-    mocker.patch("backend.services.zendesk_service.get_metrics_solved_at", 
-                 side_effect=Exception("Metrics API Down"))
+    monkeypatch.setattr(zd, "get_metrics_many", Mock(side_effect=Exception("Metrics API Down")))
     
     # Audits succeeds
-    mock_audits = mocker.patch("backend.services.zendesk_service.get_last_resolution_from_audits", 
-                               return_value="2025-09-02T12:00:00Z") 
+    mock_audits = Mock(return_value="2025-09-02T12:00:00Z")
+    monkeypatch.setattr(zd, "get_last_resolution_from_audits", mock_audits)
     
     smap = {
         1: {"status": "closed", "updated_at": "2025-09-03T00:00:00Z"},
@@ -190,6 +333,96 @@ def test_enrich_audits_fallback(mocker):
     mock_audits.assert_called_once_with(1)
 
 
+def test_enrich_audits_fallback_runs_for_each_ticket(monkeypatch):
+    """Test that concurrent audit fallbacks enrich every ticket missing a metrics value."""
+    monkeypatch.setattr(zd, "get_metrics_many", Mock(return_value={}))
+    mock_audits = Mock(side_effect=lambda tid: f"2025-09-0{tid}T12:00:00Z")
+    monkeypatch.setattr(zd, "get_last_resolution_from_audits", mock_audits)
+    smap = {1: {"status": "solved"}, 2: {"status": "closed"}}
+
+    zd.enrich_with_resolution_times(smap)
+
+    assert smap[1]["resolved_at"] == "2025-09-01T12:00:00Z"
+    assert smap[2]["resolved_at"] == "2025-09-02T12:00:00Z"
+    assert sorted(c.args[0] for c in mock_audits.call_args_list) == [1, 2]
+
+
+def test_get_metrics_many_sideloads_metric_sets(patched_retry, make_response):
+    """Test that solved_at values come from the metric_sets sideload, keyed by ticket id."""
+    patched_retry.return_value = make_response({
+        "tickets": [{"id": 1}, {"id": 2}],
+        "metric_sets": [
+            {"ticket_id": 1, "solved_at": "2025-09-01T10:00:00Z"},
+            {"ticket_id": 2, "solved_at": None},
+        ],
+    })
+    result = zd.get_metrics_many([1, 2])
+
+    assert result == {1: "2025-09-01T10:00:00Z", 2: None}
+    args, _ = patched_retry.call_args
+    assert "show_many.json?ids=1,2&include=metric_sets" in args[1]
+
+
+def test_get_metrics_many_fetches_batches(patched_retry, make_response):
+    """Test that >100 ids are split into concurrent show_many batches and merged."""
+    def fake_retry(method, url, **kwargs):
+        ids = url.split("ids=", 1)[1].split("&", 1)[0].split(",")
+        return make_response({"metric_sets": [{"ticket_id": int(i), "solved_at": f"t{i}"} for i in ids]})
+
+    patched_retry.side_effect = fake_retry
+    result = zd.get_metrics_many(range(1, 102))
+
+    assert result == {i: f"t{i}" for i in range(1, 102)}
+    assert patched_retry.call_count == 2
+    assert all(c.args[1].endswith("&include=metric_sets") for c in patched_retry.call_args_list)
+
+
+def test_enrich_reuses_cached_audit_lookup(monkeypatch, patched_retry, make_response):
+    """Test that re-enriching an unchanged resolved ticket hits the cache instead of the API."""
+    monkeypatch.setattr(zd, "get_metrics_many", Mock(return_value={}))
+    patched_retry.return_value = make_response({
+        "audits": [{
+            "created_at": "2025-09-02T12:00:00Z",
+            "events": [{"type": "Change", "field": "status", "value": "solved"}],
+        }],
+        "next_page": None,
+    })
+    monkeypatch.setattr(zd.time, "sleep", Mock())
+
+    for _ in range(2):
+        smap = {7: {"status": "solved", "updated_at": "2025-09-02T12:00:00Z"}}
+        zd.enrich_with_resolution_times(smap)
+        assert smap[7]["resolved_at"] == "2025-09-02T12:00:00Z"
+    assert patched_retry.call_count == 1
+
+    # Reopened and re-solved without ever appearing as open (e.g. a statuses=solved export):
+    # the newer updated_at misses the cache
+    zd.enrich_with_resolution_times({7: {"status": "solved", "updated_at": "2025-09-05T08:00:00Z"}})
+    assert patched_retry.call_count == 2
+
+
+def test_enrich_does_not_cache_missing_resolutions(monkeypatch):
+    """Test that a lookup that found no resolution is retried on the next enrich."""
+    monkeypatch.setattr(zd, "get_metrics_many", Mock(return_value={}))
+    mock_audits = Mock(return_value=None)
+    monkeypatch.setattr(zd, "get_last_resolution_from_audits", mock_audits)
+
+    for _ in range(2):
+        zd.enrich_with_resolution_times({3: {"status": "solved", "updated_at": "t1"}})
+    assert mock_audits.call_count == 2
+
+
+def test_resolution_cache_is_bounded(monkeypatch):
+    """Test that the resolution cache evicts least-recently-used entries past its size."""
+    monkeypatch.setattr(zd, "_RESOLUTION_CACHE_SIZE", 2)
+    for tid in (1, 2, 3):
+        zd._remember_resolution(tid, "t", f"r{tid}")
+
+    assert list(zd._resolution_cache) == [2, 3]
+    assert zd._cached_resolution(1, "t") is None
+    assert zd._cached_resolution(3, "t") == "r3"
+
+
 def test_enrich_with_resolution_times_handles_empty():
     """Test that the function handles an empty map without error."""
     smap = {}
@@ -201,60 +434,45 @@ def test_enrich_with_resolution_times_handles_empty():
 # Test API wrappers (show_many, search_by_groups_and_statuses)
 # ---------------------------------------------------------------------
 
-def test_show_many_fetches_batches(mocker):
+def test_show_many_fetches_batches(patched_retry, make_response):
     """Test that show_many handles batches and returns a combined list."""
     
-    # Mock _retry to return two pages of tickets
-    mock_page1 = MockResponse({"tickets": [{"id": i} for i in range(1, 101)]})
-    mock_page2 = MockResponse({"tickets": [{"id": 101}]})
-    
-    # Use side_effect to provide responses sequentially
-    mock_retry = mocker.patch("backend.services.zendesk_service._retry", 
-                              side_effect=[mock_page1, mock_page2])
-    
-    # Mock config helper
-    mocker.patch("backend.services.zendesk_service._get_config", return_value={
-        'base_url': 'https://mock.zendesk.com/api/v2',
-        'email': 'u@e.com',
-        'token': 't'
-    })
+    # Batches run concurrently, so answer by URL rather than by call order
+    def fake_retry(method, url, **kwargs):
+        ids = url.split("ids=", 1)[1].split(",")
+        return make_response({"tickets": [{"id": int(i)} for i in ids]})
 
+    patched_retry.side_effect = fake_retry
+    
     ticket_ids = [str(i) for i in range(1, 102)]
     result = zd.show_many(ticket_ids)
     
     assert len(result) == 101
-    assert mock_retry.call_count == 2
+    assert [t["id"] for t in result] == list(range(1, 102)) # Flattened in batch order
+    assert patched_retry.call_count == 2
     
     # Check that URLs were formatted correctly (e.g., batching 1-100 and 101)
-    args1, _ = mock_retry.call_args_list[0]
-    args2, _ = mock_retry.call_args_list[1]
-    assert "ids=1,2,3" in args1[1] # Check part of first batch
-    assert "ids=101" in args2[1] # Check second batch
+    urls = sorted(c.args[1] for c in patched_retry.call_args_list)
+    assert any("ids=1,2,3" in u for u in urls) # Check part of first batch
+    assert any(u.endswith("ids=101") for u in urls) # Check second batch
+    assert all(c.args[0] == "GET" for c in patched_retry.call_args_list) # Pages go through the pooled session
 
     
-def test_search_by_groups_and_statuses(mocker):
+def test_search_by_groups_and_statuses(patched_retry, make_response):
     """Test the pagination and query construction of the search API."""
     
     # Mock responses for two pages of search results
-    search_page1 = MockResponse({
+    search_page1 = make_response({
         "results": [{"id": 10, "result_type": "ticket", "status": "open"}],
         "next_page": "https://mock.zendesk.com/api/v2/search.json?page=2",
     })
-    search_page2 = MockResponse({
+    search_page2 = make_response({
         "results": [{"id": 20, "result_type": "ticket", "status": "pending"}],
         "next_page": None,
     })
     
-    mocker.patch("backend.services.zendesk_service._retry", 
-                 side_effect=[search_page1, search_page2])
+    patched_retry.side_effect = [search_page1, search_page2]
     
-    # Mock config helper
-    mocker.patch("backend.services.zendesk_service._get_config", return_value={
-        'base_url': 'https://mock.zendesk.com/api/v2',
-        'email': 'u@e.com',
-        'token': 't'
-    })
-
     group_ids = ["1", "2"]
     statuses = ["open", "pending"]
     result = zd.search_by_groups_and_statuses(group_ids, statuses)
@@ -262,11 +480,11 @@ def test_search_by_groups_and_statuses(mocker):
     assert len(result) == 2
     assert result[0]['id'] == 10
     
-    # Check that pagination occurred
-    mock_retry = zd._retry
-    assert mock_retry.call_count == 2
+    # Check that pagination occurred, following next_page as returned
+    assert patched_retry.call_count == 2
+    assert patched_retry.call_args_list[1].args[1] == "https://mock.zendesk.com/api/v2/search.json?page=2"
     
     # Check that the query was constructed correctly
-    args1, _ = mock_retry.call_args_list[0]
+    args1, _ = patched_retry.call_args_list[0]
     search_url = args1[1] # The URL passed to the GET request
     assert "query=type%3Aticket%20%28group_id%3A1%20OR%20group_id%3A2%29%20%28status%3Aopen%20OR%20status%3Apending%29" in search_url
\ No newline at end of file